@@ -6,18 +6,20 @@ This script initializes the bot environment, runs startup checks,
 and launches the bot application.
 """
 
-import json
+import heapq
 import logging
 import os
 import subprocess
 import sys
 import time
-from datetime import datetime
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
 
-# Add scripts directory to Python path
-scripts_dir = os.path.join(os.path.dirname(__file__), "..", "scripts")
-sys.path.insert(0, scripts_dir)
+# The scripts package lives in the project root, which compose already puts
+# on PYTHONPATH; only extend sys.path when run some other way
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 try:
     from scripts import (
@@ -30,7 +32,7 @@ try:
     )
 except ImportError as e:
     print(f"Failed to import scripts: {e}")
-    print(f"Scripts directory: {scripts_dir}")
+    print(f"Project root: {project_root}")
     print(f"Python path: {sys.path[:3]}")
     sys.exit(1)
 
@@ -38,6 +40,7 @@ except ImportError as e:
 DATA_DIR = Path("/app/data")
 LOGS_DIR = Path("/app/logs")
 DEFAULT_JSON_FILES = ["bot_admins.json", "bot_users.json", "quotes.json"]
+ARCHIVES_TO_KEEP = 5
 
 # Setup logging
 logging.basicConfig(
@@ -47,6 +50,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Health monitor log, written to LOGS_DIR / "health.log" by setup_health_system
+HEALTH_LOG_MAX_BYTES = 5_000_000
+HEALTH_LOG_BACKUPS = 3
+health_logger = logging.getLogger("health")
+health_logger.setLevel(logging.INFO)
+health_logger.propagate = False
+
 
 def log_message(level: str, message: str):
     """Log message to console with timestamp"""
@@ -193,7 +203,7 @@ def cleanup_unused_images():
         # Remove project-specific dangling images
         if project_dangling_list:
             result = subprocess.run(
-                ["docker", "rmi"] + project_dangling_list,
+                ["docker", "rmi", *project_dangling_list],
                 capture_output=True,
                 text=True,
                 check=False,
@@ -211,26 +221,41 @@ def setup_health_system():
     """Initialize the health monitoring system"""
     log_message("INFO", "Initializing health monitoring system")
 
+    # health.log is size-rotated; records are buffered in memory and written
+    # once per monitoring cycle (errors are written immediately)
+    file_handler = RotatingFileHandler(
+        LOGS_DIR / "health.log",
+        maxBytes=HEALTH_LOG_MAX_BYTES,
+        backupCount=HEALTH_LOG_BACKUPS,
+    )
+    file_handler.setFormatter(logging.Formatter("%(asctime)s: %(message)s"))
+    health_logger.addHandler(
+        MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=file_handler)
+    )
+
     # Create simple health status in logs
-    health_log = LOGS_DIR / "health.log"
-    with open(health_log, "a") as f:
-        f.write(f"{datetime.now()}: Bot is starting up\n")
+    health_logger.info("Bot is starting up")
+    flush_health_log()
 
     log_message("INFO", "Health monitoring system initialized")
 
 
+def flush_health_log():
+    """Write buffered health log records to disk"""
+    for handler in health_logger.handlers:
+        handler.flush()
+
+
 def rotate_logs():
     """Rotate logs to prevent accumulation of old errors"""
     log_message("INFO", "Setting up log rotation")
 
-    # Create logs directory if it doesn't exist
-    LOGS_DIR.mkdir(parents=True, exist_ok=True)
-
+    # LOGS_DIR is created by main() before any of the setup steps run
     bot_log = LOGS_DIR / "bot.log"
 
     # If log file exists and is not empty, rotate it
     if bot_log.exists() and bot_log.stat().st_size > 0:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         backup_dir = LOGS_DIR / "archive"
         backup_dir.mkdir(parents=True, exist_ok=True)
 
@@ -242,31 +267,36 @@ def rotate_logs():
         # Reset current log file (create new empty file)
         with open(bot_log, "w") as f:
             f.write(
-                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [INFO] Log file rotated - new session started\n",
+                f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] [INFO] Log file rotated - new session started\n",
             )
 
-        # Clean up old archives (keep last 5)
-        archive_files = sorted(
-            backup_dir.glob("bot_*.log"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True,
-        )
-        if len(archive_files) > 5:
+        # Clean up old archives, keeping the newest ones
+        with os.scandir(backup_dir) as entries:
+            archive_files = {
+                entry.path: entry.stat().st_mtime
+                for entry in entries
+                if entry.name.startswith("bot_") and entry.name.endswith(".log")
+            }
+        if len(archive_files) > ARCHIVES_TO_KEEP:
             log_message(
                 "INFO",
-                "Cleaning up old log archives, keeping only the 5 most recent",
+                f"Cleaning up old log archives, keeping only the "
+                f"{ARCHIVES_TO_KEEP} most recent",
+            )
+            newest = set(
+                heapq.nlargest(ARCHIVES_TO_KEEP, archive_files, key=archive_files.get)
             )
-            for old_file in archive_files[5:]:
-                old_file.unlink()
+            for old_file in archive_files.keys() - newest:
+                os.unlink(old_file)
     else:
         # Create new log file if it doesn't exist
         with open(bot_log, "w") as f:
             f.write(
-                f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] [INFO] New log file created - session started\n",
+                f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] [INFO] New log file created - session started\n",
             )
 
     # Ensure proper permissions
-    bot_log.chmod(0o644)
+    os.chmod(bot_log, 0o644)
     log_message("INFO", "Log rotation completed")
 
 
@@ -277,14 +307,16 @@ def setup_data_directory():
     # Create data directory if it doesn't exist
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Create default JSON files if they don't exist
+    # Create default JSON files if they don't exist; one directory read
+    # replaces a stat per file
+    with os.scandir(DATA_DIR) as entries:
+        existing_files = {entry.name for entry in entries}
     for file_name in DEFAULT_JSON_FILES:
         file_path = DATA_DIR / file_name
-        if not file_path.exists():
+        if file_name not in existing_files:
             log_message("WARN", f"{file_name} not found, creating empty file")
-            with open(file_path, "w") as f:
-                json.dump([], f)
-            file_path.chmod(0o644)
+            file_path.write_bytes(b"[]")
+            os.chmod(file_path, 0o644)
 
     # Setup permissions using the new module
     log_message("INFO", "Setting up permissions")
@@ -296,11 +328,13 @@ def setup_data_directory():
     # List data directory contents for logging
     log_message("INFO", "Data directory contents:")
     try:
-        for item in DATA_DIR.iterdir():
+        with os.scandir(DATA_DIR) as entries:
+            items = list(entries)
+        for item in items:
             stat = item.stat()
             permissions = oct(stat.st_mode)[-3:]
             size = stat.st_size
-            mtime = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M")
+            mtime = time.strftime("%Y-%m-%d %H:%M", time.localtime(stat.st_mtime))
             print_message(
                 f"    {permissions} {size:>8} {mtime} {item.name}",
                 Colors.CYAN,
@@ -318,32 +352,20 @@ def start_health_monitor():
         # Wait for the bot to start up before first check
         time.sleep(10)
 
-        health_log = LOGS_DIR / "health.log"
-
         # Check every 30 seconds if the bot is operational
         while True:
             try:
-                with open(health_log, "a") as f:
-                    f.write(
-                        f"{datetime.now()}: Running health check monitoring cycle\n",
-                    )
+                health_logger.info("Running health check monitoring cycle")
 
                 # Check if the bot process is running using our health check module
-                is_healthy = quick_health_check()
-
-                with open(health_log, "a") as f:
-                    if is_healthy:
-                        f.write(f"{datetime.now()}: Bot process is healthy\n")
-                    else:
-                        f.write(
-                            f"{datetime.now()}: WARNING - Bot health check failed\n",
-                        )
-
-                time.sleep(30)
+                if quick_health_check():
+                    health_logger.info("Bot process is healthy")
+                else:
+                    health_logger.warning("WARNING - Bot health check failed")
             except Exception as e:
-                with open(health_log, "a") as f:
-                    f.write(f"{datetime.now()}: ERROR in health monitor: {e}\n")
-                time.sleep(30)
+                health_logger.error(f"ERROR in health monitor: {e}")
+            flush_health_log()
+            time.sleep(30)
 
     # Start daemon in background
     import threading
@@ -414,7 +436,7 @@ def main():
     # Check if we can write to the log directory
     if not os.access(LOGS_DIR, os.W_OK):
         log_message("WARN", f"Cannot write to {LOGS_DIR} directory, fixing permissions")
-        LOGS_DIR.chmod(0o755)
+        os.chmod(LOGS_DIR, 0o755)
 
     # Set Python path to include the app directory
     python_path = os.getenv("PYTHONPATH", "")
@@ -9,27 +9,20 @@ Single tool for all bot management operations with rich functionality.
 import argparse
 import importlib.util
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import Optional
-
-# Add scripts directory to Python path for importing scripts
-sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from typing import List, Optional
 
+# Only the light helpers are imported up front; each action handler is
+# imported by the BotManager method that runs it, so --help and argument
+# errors do not load the Docker and health tooling
 try:
     from scripts import (
         BotError,
         Colors,
         DockerError,
-        action_cleanup,
-        action_logs,
-        action_prune,
-        action_restart,
-        action_setup,
-        action_start,
-        action_status,
-        action_stop,
         handle_error,
         print_error,
         print_message,
@@ -41,13 +34,28 @@ except ImportError as e:
     print("🔧 Please ensure scripts are properly installed")
     sys.exit(1)
 
+# Directory containing this file; all management commands run from here
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Printed in one write at the end of dev-setup
+_DEV_SETUP_NEXT_STEPS = """
+📝 Next steps:
+1. Reload VS Code window (Cmd+Shift+P → 'Developer: Reload Window')
+2. Make sure VS Code uses ./venv/bin/python3 as interpreter
+3. Run 'make install' to start the bot
+
+💡 For development:
+   - Always activate virtual environment: source venv/bin/activate
+   - Use 'make setup' for initial Docker setup
+   - Use 'make start' to run the bot"""
+
 
 class BotManager:
     """Modern bot management class with rich functionality"""
 
     def __init__(self):
         """Initialize the bot manager"""
-        self.project_root = Path(__file__).parent.absolute()
+        self.project_root = PROJECT_ROOT
         os.chdir(self.project_root)
 
         # Setup environment using scripts
@@ -57,6 +65,8 @@ class BotManager:
 
     def setup(self, token: Optional[str] = None) -> bool:
         """Initial project setup with comprehensive configuration"""
+        from scripts import action_setup
+
         try:
             return action_setup(token=token)
         except (BotError, DockerError) as e:
@@ -73,11 +83,15 @@ class BotManager:
         enable_logging: bool = False,
     ) -> bool:
         """Start the bot with advanced options"""
+        from scripts import StartOptions, action_start
+
         try:
             return action_start(
-                force_rebuild=force_rebuild,
-                enable_monitoring=enable_monitoring,
-                enable_logging=enable_logging,
+                StartOptions(
+                    force_rebuild=force_rebuild,
+                    enable_monitoring=enable_monitoring,
+                    enable_logging=enable_logging,
+                )
             )
         except (BotError, DockerError) as e:
             handle_error(e)
@@ -88,6 +102,8 @@ class BotManager:
 
     def stop(self, cleanup: bool = False) -> bool:
         """Stop the bot with optional cleanup"""
+        from scripts import action_stop
+
         try:
             return action_stop(confirm=True)
         except (BotError, DockerError) as e:
@@ -99,6 +115,8 @@ class BotManager:
 
     def restart(self, force_rebuild: bool = False) -> bool:
         """Restart the bot service"""
+        from scripts import action_restart
+
         try:
             return action_restart()
         except (BotError, DockerError) as e:
@@ -110,6 +128,8 @@ class BotManager:
 
     def status(self) -> bool:
         """Show comprehensive bot status with full monitoring and diagnostics"""
+        from scripts import action_status
+
         try:
             return action_status()
         except (BotError, DockerError) as e:
@@ -121,6 +141,8 @@ class BotManager:
 
     def logs(self, follow: bool = False, lines: int = 50) -> bool:
         """Show bot logs with filtering options"""
+        from scripts import action_logs
+
         try:
             return action_logs(follow=follow, lines=lines)
         except (BotError, DockerError) as e:
@@ -132,6 +154,8 @@ class BotManager:
 
     def clean(self, deep: bool = False) -> bool:
         """Clean up containers and images"""
+        from scripts import action_cleanup, action_prune
+
         try:
             if deep:
                 return action_prune()
@@ -233,10 +257,16 @@ class BotManager:
             return False
 
     def _check_bot_startup(self) -> bool:
-        """Test if bot can start without errors"""
+        """Test if the bot module imports without errors
+
+        The import runs in a child interpreter, so the bot's configuration
+        (.env loading, logging setup, data directories) does not leak into
+        this process. Importing does not start the bot.
+        """
         try:
             result = subprocess.run(
-                [sys.executable, "src/bot.py", "--help"],
+                [sys.executable, "-c", "import src.bot"],
+                cwd=PROJECT_ROOT,
                 capture_output=True,
                 text=True,
                 timeout=10,
@@ -259,9 +289,7 @@ class BotManager:
         print_message("🚀 Local Development Environment Setup", Colors.BLUE)
         print("=" * 40)
 
-        # Change to project directory
-        project_root = Path(__file__).parent
-        os.chdir(project_root)
+        # The working directory is already PROJECT_ROOT (see __init__)
 
         # Check requirements
         if not self._check_dev_requirements():
@@ -276,14 +304,7 @@ class BotManager:
         self._setup_vscode_workspace()
 
         print_success("\n🎉 Setup completed successfully!")
-        print("\n📝 Next steps:")
-        print("1. Reload VS Code window (Cmd+Shift+P → 'Developer: Reload Window')")
-        print("2. Make sure VS Code uses ./venv/bin/python3 as interpreter")
-        print("3. Run 'make install' to start the bot")
-        print("\n💡 For development:")
-        print("   - Always activate virtual environment: source venv/bin/activate")
-        print("   - Use 'make setup' for initial Docker setup")
-        print("   - Use 'make start' to run the bot")
+        print(_DEV_SETUP_NEXT_STEPS)
 
         return True
 
@@ -296,18 +317,23 @@ class BotManager:
         # Remove existing venv if it exists
         if venv_path.exists():
             print("   🗑️  Removing existing virtual environment...")
-            if not self._run_command("rm -rf venv", "Cleaning old environment"):
+            print("🔧 Cleaning old environment...")
+            try:
+                shutil.rmtree(venv_path)
+            except OSError as e:
+                print(f"   ❌ Error: {e}")
                 return False
 
         # Create new virtual environment
         if not self._run_command(
-            "python3 -m venv venv", "Creating virtual environment"
+            ["python3", "-m", "venv", "venv"], "Creating virtual environment"
         ):
             return False
 
-        # Install dependencies including dev tools
+        # Install dependencies including dev tools. The venv's own
+        # interpreter is used directly, so no activating shell is needed.
         if not self._run_command(
-            "source venv/bin/activate && pip install -e '.[dev]'",
+            [str(venv_path / "bin" / "python"), "-m", "pip", "install", "-e", ".[dev]"],
             "Installing dev dependencies",
         ):
             return False
@@ -337,33 +363,34 @@ class BotManager:
         print("🔍 Checking requirements...")
 
         # Check Python 3
-        if not self._run_command("python3 --version", "Checking Python 3"):
+        if not self._run_command(["python3", "--version"], "Checking Python 3"):
             print("❌ Python 3 is required. Please install Python 3.9+")
             return False
 
         # Check pip
-        if not self._run_command("python3 -m pip --version", "Checking pip"):
+        if not self._run_command(["python3", "-m", "pip", "--version"], "Checking pip"):
             print("❌ pip is required. Please install pip")
             return False
 
         print("   ✅ All requirements satisfied!")
         return True
 
-    def _run_command(self, cmd: str, description: str = "") -> bool:
-        """Run a shell command and return success status"""
+    def _run_command(self, cmd: List[str], description: str = "") -> bool:
+        """Run a command without a shell and return success status"""
         if description:
             print(f"🔧 {description}...")
 
         try:
-            result = subprocess.run(
-                cmd, shell=True, check=True, capture_output=True, text=True
-            )
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
             if result.stdout:
                 print(f"   ✅ {result.stdout.strip()}")
             return True
         except subprocess.CalledProcessError as e:
             print(f"   ❌ Error: {e.stderr.strip() if e.stderr else str(e)}")
             return False
+        except OSError as e:
+            print(f"   ❌ Error: {e}")
+            return False
 
 
 def main():
@@ -484,38 +511,22 @@ def main():
         manager = BotManager()
 
         # Execute action with appropriate arguments
-        success = False
-
-        if args.action == "setup":
-            success = manager.setup(token=args.token)
-
-        elif args.action == "start":
-            success = manager.start(
+        handlers = {
+            "setup": lambda: manager.setup(token=args.token),
+            "start": lambda: manager.start(
                 force_rebuild=args.rebuild,
                 enable_monitoring=args.monitoring,
                 enable_logging=args.logging,
-            )
-
-        elif args.action == "stop":
-            success = manager.stop(cleanup=args.cleanup)
-
-        elif args.action == "restart":
-            success = manager.restart(force_rebuild=args.rebuild)
-
-        elif args.action == "status":
-            success = manager.status()
-
-        elif args.action == "logs":
-            success = manager.logs(follow=args.follow, lines=args.lines)
-
-        elif args.action == "clean":
-            success = manager.clean(deep=args.deep)
-
-        elif args.action == "check-env":
-            success = manager.check_environment()
-
-        elif args.action == "dev-setup":
-            success = manager.dev_setup()
+            ),
+            "stop": lambda: manager.stop(cleanup=args.cleanup),
+            "restart": lambda: manager.restart(force_rebuild=args.rebuild),
+            "status": manager.status,
+            "logs": lambda: manager.logs(follow=args.follow, lines=args.lines),
+            "clean": lambda: manager.clean(deep=args.deep),
+            "check-env": manager.check_environment,
+            "dev-setup": manager.dev_setup,
+        }
+        success = handlers[args.action]()
 
         # Exit with appropriate code
         if success:
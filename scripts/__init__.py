@@ -2,97 +2,124 @@
 Scripts modules package for quit-smoking-bot
 
 This package contains utility modules for bot management scripts.
+
+Submodules are imported on first use of one of their names, so commands
+that only need a few helpers (or just print ``--help``) do not load the
+Docker and health tooling.
 """
 
-# Core utilities
-# Action handlers
-from .actions import (
-    action_backup,
-    action_cleanup,
-    action_logs,
-    action_prune,
-    action_restart,
-    action_setup,
-    action_start,
-    action_status,
-    action_stop,
-)
+from importlib import import_module
+from typing import Any, Dict, List, Tuple
 
-# Argument parsing
-from .args import (
-    create_health_parser,
-    parse_and_setup_args,
-    prompt_for_token,
-    validate_token,
-)
+# Public names exported by each submodule
+_SUBMODULE_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    # Action handlers
+    "actions": (
+        "StartOptions",
+        "action_backup",
+        "action_cleanup",
+        "action_logs",
+        "action_prune",
+        "action_restart",
+        "action_setup",
+        "action_start",
+        "action_status",
+        "action_stop",
+    ),
+    # Argument parsing
+    "args": (
+        "create_health_parser",
+        "parse_and_setup_args",
+        "prompt_for_token",
+        "validate_token",
+    ),
+    # Conflict detection
+    "conflicts": (
+        "check_port_conflict",
+        "check_telegram_token_conflict",
+        "detect_all_conflicts",
+    ),
+    # Docker utilities
+    "docker_utils": (
+        "check_docker_installation",
+        "cleanup_docker_resources",
+        "get_container_status",
+        "is_service_running",
+    ),
+    # Environment and configuration
+    "environment": (
+        "check_bot_token",
+        "check_env_var",
+        "get_system_name",
+        "is_debug_mode",
+        "is_dry_run",
+        "load_env",
+        "setup_environment",
+        "update_env_token",
+    ),
+    "errors": (
+        "BotError",
+        "ConfigError",
+        "DockerError",
+        "EnvironmentError",
+        "ErrorContext",
+        "ServiceError",
+        "handle_error",
+    ),
+    # Health monitoring
+    "health": (
+        "HealthSnapshot",
+        "capture_health_snapshot",
+        "check_bot_status",
+        "comprehensive_health_check",
+        "is_bot_healthy",
+        "is_bot_operational",
+        "quick_health_check",
+    ),
+    "output": (
+        "Colors",
+        "debug_print",
+        "print_error",
+        "print_header",
+        "print_message",
+        "print_section",
+        "print_success",
+        "print_warning",
+        "refresh_debug_mode",
+    ),
+    # Service management
+    "service": (
+        "get_service_status",
+        "restart_service",
+        "start_service",
+        "stop_service",
+        "wait_for_service_stopped",
+    ),
+    # System utilities
+    "system": (
+        "get_system_info",
+        "setup_permissions",
+    ),
+}
 
-# Conflict detection
-from .conflicts import (
-    check_port_conflict,
-    check_telegram_token_conflict,
-    detect_all_conflicts,
-)
+_EXPORTS: Dict[str, str] = {
+    name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names
+}
 
-# Docker utilities
-from .docker_utils import (
-    check_docker_installation,
-    cleanup_docker_resources,
-    get_container_status,
-)
 
-# Environment and configuration
-from .environment import (
-    check_bot_token,
-    check_env_var,
-    get_system_name,
-    is_debug_mode,
-    is_dry_run,
-    load_env,
-    setup_environment,
-    update_env_token,
-)
-from .errors import (
-    BotError,
-    ConfigError,
-    DockerError,
-    EnvironmentError,
-    ErrorContext,
-    ServiceError,
-    handle_error,
-)
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining ``name`` on first access"""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
 
-# Health monitoring
-from .health import (
-    check_bot_status,
-    comprehensive_health_check,
-    is_bot_healthy,
-    is_bot_operational,
-    quick_health_check,
-)
-from .output import (
-    Colors,
-    debug_print,
-    print_error,
-    print_header,
-    print_message,
-    print_section,
-    print_success,
-    print_warning,
-)
 
-# Service management
-from .service import (
-    get_service_status,
-    restart_service,
-    start_service,
-    stop_service,
-)
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
 
-# System utilities
-from .system import (
-    get_system_info,
-    setup_permissions,
-)
 
 __all__ = [
     # Core utilities
@@ -101,6 +128,7 @@ __all__ = [
     "print_section",
     "print_header",
     "debug_print",
+    "refresh_debug_mode",
     "print_success",
     "print_error",
     "print_warning",
@@ -123,9 +151,12 @@ __all__ = [
     # Docker utilities
     "check_docker_installation",
     "get_container_status",
+    "is_service_running",
     "cleanup_docker_resources",
     # Health monitoring
     "quick_health_check",
+    "HealthSnapshot",
+    "capture_health_snapshot",
     "comprehensive_health_check",
     "is_bot_healthy",
     "is_bot_operational",
@@ -135,6 +166,7 @@ __all__ = [
     "start_service",
     "stop_service",
     "restart_service",
+    "wait_for_service_stopped",
     # System utilities
     "setup_permissions",
     "get_system_info",
@@ -152,6 +184,7 @@ __all__ = [
     "action_cleanup",
     "action_prune",
     "action_backup",
+    "StartOptions",
     # Argument parsing
     "create_health_parser",
     "parse_and_setup_args",
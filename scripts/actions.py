@@ -4,22 +4,38 @@ actions.py - Action handlers and core operations
 This module provides action handlers for bot management operations.
 """
 
+import json
 import os
 import subprocess
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from .docker_utils import (
     auto_cleanup_images_before_build,
     check_docker_installation,
     cleanup_dangling_images,
     cleanup_docker_resources,
+    compose_command,
+    get_container_resource_usage,
     get_container_status,
+    invalidate_container_status,
+    is_service_running,
+    print_compose_ps,
+    run_command,
+    run_silent,
 )
 from .environment import check_bot_token, get_system_name, is_dry_run, update_env_token
 from .errors import BotError, DockerError, ErrorContext
-from .health import check_bot_status, comprehensive_health_check, is_bot_operational
+from .health import (
+    capture_health_snapshot,
+    check_bot_status,
+    comprehensive_health_check,
+    is_bot_operational,
+)
 from .output import (
     Colors,
     debug_print,
@@ -28,6 +44,7 @@ from .output import (
     print_success,
     print_warning,
 )
+from .service import wait_for_service_stopped
 
 
 def action_setup(token: Optional[str] = None) -> bool:
@@ -81,28 +98,31 @@ def action_setup(token: Optional[str] = None) -> bool:
         return True
 
 
-def action_start(
-    dry_run: bool = False,
-    force_rebuild: bool = False,
-    enable_monitoring: bool = False,
-    enable_logging: bool = False,
-) -> bool:
+@dataclass(frozen=True)
+class StartOptions:
+    """Options for starting the bot service"""
+
+    dry_run: bool = False
+    force_rebuild: bool = False
+    enable_monitoring: bool = False
+    enable_logging: bool = False
+
+
+def action_start(options: Optional[StartOptions] = None) -> bool:
     """Start the bot service"""
-    debug_print(f"Starting bot, dry_run: {dry_run}")
+    if options is None:
+        options = StartOptions()
+    dry_run = options.dry_run or is_dry_run()
+    debug_print(f"Starting bot, options: {options}")
 
     with ErrorContext("Bot start"):
         print_message(f"🚀 Starting {get_system_name()}...", Colors.BLUE)
 
         # Check if already running
-        status = get_container_status()
-        if status["running"]:
+        if is_service_running("bot"):
             print_warning("Bot is already running!")
             print_message("Container status:", Colors.YELLOW)
-            subprocess.run(
-                ["docker-compose", "-f", "docker/docker-compose.yml", "ps"],
-                check=False,
-                capture_output=False,
-            )
+            print_compose_ps()
             return True
 
         # Check Docker
@@ -118,16 +138,10 @@ def action_start(
         auto_cleanup_images_before_build()
 
         # Build containers if needed
-        if force_rebuild:
+        if options.force_rebuild:
             print_message("Force rebuilding Docker containers...", Colors.YELLOW)
-            build_cmd = [
-                "docker-compose",
-                "-f",
-                "docker/docker-compose.yml",
-                "build",
-                "--no-cache",
-            ]
-            if dry_run or is_dry_run():
+            build_cmd = compose_command("build", "--no-cache")
+            if dry_run:
                 print_message(
                     f"DRY RUN: Would execute: {' '.join(build_cmd)}",
                     Colors.YELLOW,
@@ -143,18 +157,22 @@ def action_start(
                 )
                 cleanup_dangling_images(verbose=False)
 
-        # Determine compose profiles
-        compose_profiles = []
-        if enable_monitoring:
-            compose_profiles.append("monitoring")
-        if enable_logging:
-            compose_profiles.append("logging")
+        # Compose profile flags for the optional services
+        profile_args = [
+            arg
+            for name, enabled in (
+                ("monitoring", options.enable_monitoring),
+                ("logging", options.enable_logging),
+            )
+            if enabled
+            for arg in ("--profile", name)
+        ]
 
         # Prepare environment variables for docker-compose
         env = os.environ.copy()
 
-        if dry_run or is_dry_run():
-            profiles_str = " ".join(f"--profile {p}" for p in compose_profiles)
+        if dry_run:
+            profiles_str = " ".join(profile_args)
             print_message(
                 "DRY RUN: Would start bot with the following command:",
                 Colors.YELLOW,
@@ -164,14 +182,10 @@ def action_start(
 
         # Start the service
         print_message("Starting bot container...", Colors.YELLOW)
-        cmd = ["docker-compose", "-f", "docker/docker-compose.yml"]
-
-        # Add profiles for additional services
-        for profile_name in compose_profiles:
-            cmd.extend(["--profile", profile_name])
-        cmd.extend(["up", "-d", "--build"])
+        cmd = compose_command(*profile_args, "up", "-d", "--build")
 
         result = subprocess.run(cmd, check=False, env=env, capture_output=False)
+        invalidate_container_status()
         if result.returncode != 0:
             raise DockerError("Failed to start bot container", " ".join(cmd))
 
@@ -202,8 +216,7 @@ def action_stop(confirm: bool = False) -> bool:
 
     with ErrorContext("Bot stop"):
         # Check if running
-        status = get_container_status()
-        if not status["running"]:
+        if not is_service_running("bot"):
             print_message("Bot is not running", Colors.YELLOW)
             return True
 
@@ -217,10 +230,9 @@ def action_stop(confirm: bool = False) -> bool:
         print_message("🛑 Stopping bot...", Colors.YELLOW)
 
         result = subprocess.run(
-            ["docker-compose", "-f", "docker/docker-compose.yml", "down"],
-            check=False,
-            capture_output=False,
+            compose_command("down"), check=False, capture_output=False
         )
+        invalidate_container_status()
         if result.returncode != 0:
             raise DockerError("Failed to stop bot container")
 
@@ -242,8 +254,9 @@ def action_restart() -> bool:
     print_message("Cleaning up dangling images during restart...", Colors.YELLOW)
     cleanup_dangling_images(verbose=False)
 
-    # Wait a moment
-    time.sleep(2)
+    # Wait until the old container is actually down
+    if not wait_for_service_stopped("all"):
+        print_warning("Bot container is still running after stop")
 
     # Start again
     return action_start()
@@ -257,6 +270,51 @@ def action_status() -> bool:
     return _run_comprehensive_status()
 
 
+def _list_container_rows(container_name: str) -> List[Dict[str, Any]]:
+    """List containers matching a name as parsed ``docker ps`` JSON rows"""
+    result = run_command(
+        [
+            "docker",
+            "ps",
+            "--filter",
+            f"name={container_name}",
+            "--format",
+            "{{json .}}",
+        ],
+    )
+    return [json.loads(line) for line in result.stdout.splitlines() if line]
+
+
+def _print_resource_usage(container_name: str, usage: Optional[Dict[str, str]]) -> None:
+    """Print a docker stats style resource usage table for a container"""
+    if usage:
+        print(f"{'CONTAINER':<24}{'CPU %':<10}{'MEM USAGE / LIMIT':<24}NET I/O")
+        print(
+            f"{usage['container']:<24}{usage['cpu_percent']:<10}"
+            f"{usage['mem_usage']:<24}{usage['net_io']}"
+        )
+        return
+
+    # Docker API socket not reachable, ask the CLI instead
+    result = subprocess.run(
+        [
+            "docker",
+            "stats",
+            "--no-stream",
+            "--format",
+            "table {{.Container}}\t{{.CPUPerc}}\t{{.MemUsage}}\t{{.NetIO}}",
+            container_name,
+        ],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode == 0 and result.stdout.strip():
+        print(result.stdout)
+    else:
+        print_message("Resource usage not available", Colors.YELLOW)
+
+
 def _run_comprehensive_status() -> bool:
     """Run comprehensive status check with all monitoring and diagnostics"""
     total_checks = 0
@@ -276,19 +334,18 @@ def _run_comprehensive_status() -> bool:
         )
         return True
 
+    # Container probes shared by the operational and health checks
+    snapshot = capture_health_snapshot() if status["running"] else None
+
     if status["running"]:
         print_message("✅ Bot container is running", Colors.GREEN)
 
         # Show container info
         print_message("\n📋 Container Status:", Colors.BLUE)
-        subprocess.run(
-            ["docker-compose", "-f", "docker/docker-compose.yml", "ps"],
-            check=False,
-            capture_output=False,
-        )
+        print_compose_ps()
 
         # Check operational status
-        if is_bot_operational():
+        if is_bot_operational(snapshot):
             print_message("\n✅ Bot is operational", Colors.GREEN)
         else:
             print_message(
@@ -299,15 +356,7 @@ def _run_comprehensive_status() -> bool:
         # Show recent logs
         print_message("\n📝 Recent Logs:", Colors.BLUE)
         subprocess.run(
-            [
-                "docker-compose",
-                "-f",
-                "docker/docker-compose.yml",
-                "logs",
-                "--tail",
-                "10",
-                "bot",
-            ],
+            compose_command("logs", "--tail", "10", "bot"),
             check=False,
             capture_output=False,
         )
@@ -319,85 +368,63 @@ def _run_comprehensive_status() -> bool:
             Colors.YELLOW,
         )
 
-    # === HEALTH MONITORING ===
-    print_message("\n🏥 Health Monitoring:", Colors.BLUE)
-    total_checks += 1
-    if comprehensive_health_check():
-        print_message("✅ Health checks passed", Colors.GREEN)
-    else:
-        print_message("❌ Health checks failed", Colors.RED)
-        failed_checks += 1
-
-    # === CONTAINER DIAGNOSTICS ===
-    if status["running"]:
-        try:
-            subprocess.run(["docker", "--version"], capture_output=True, check=True)
-            print_message("\n🐳 Container Diagnostics:", Colors.BLUE)
-            total_checks += 1
-
-            from .environment import get_system_name
-
-            container_name = get_system_name()
+    # The container diagnostics only read Docker state, so their probes are
+    # started now and overlap the health checks below
+    container_name = get_system_name()
+    # The pool only starts threads for submitted probes
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        probes = {}
+        if status["running"]:
+            probes["docker"] = executor.submit(run_silent, ["docker", "--version"])
             if container_name:
-                result = subprocess.run(
-                    [
-                        "docker",
-                        "ps",
-                        "--format",
-                        "{{.Names}}",
-                        "--filter",
-                        f"name={container_name}",
-                    ],
-                    check=False,
-                    capture_output=True,
-                    text=True,
+                probes["rows"] = executor.submit(_list_container_rows, container_name)
+                probes["usage"] = executor.submit(
+                    get_container_resource_usage, container_name
                 )
 
-                if container_name in result.stdout:
-                    print_message("✅ Container is running", Colors.GREEN)
-
-                    # Show container details
-                    print_message("\n📊 Container Details:", Colors.YELLOW)
-                    subprocess.run(
-                        [
-                            "docker",
-                            "ps",
-                            "--filter",
-                            f"name={container_name}",
-                            "--format",
-                            "table {{.Names}}\t{{.Status}}\t{{.Image}}\t{{.Ports}}",
-                        ],
-                        check=False,
-                    )
-
-                    # Show resource usage
-                    print_message("\n💻 Resource Usage:", Colors.YELLOW)
-                    result = subprocess.run(
-                        [
-                            "docker",
-                            "stats",
-                            "--no-stream",
-                            "--format",
-                            "table {{.Container}}\t{{.CPUPerc}}\t{{.MemUsage}}\t{{.NetIO}}",
-                            container_name,
-                        ],
-                        check=False,
-                        capture_output=True,
-                        text=True,
-                    )
-                    if result.returncode == 0 and result.stdout.strip():
-                        print(result.stdout)
-                    else:
-                        print_message("Resource usage not available", Colors.YELLOW)
-                else:
-                    print_message("❌ Container is not running", Colors.RED)
-                    failed_checks += 1
+        # === HEALTH MONITORING ===
+        print_message("\n🏥 Health Monitoring:", Colors.BLUE)
+        total_checks += 1
+        if comprehensive_health_check(snapshot):
+            print_message("✅ Health checks passed", Colors.GREEN)
+        else:
+            print_message("❌ Health checks failed", Colors.RED)
+            failed_checks += 1
 
-        except subprocess.CalledProcessError:
+        # === CONTAINER DIAGNOSTICS ===
+        if status["running"] and probes["docker"].result() != 0:
             print_message("⚠️  Docker not available", Colors.YELLOW)
-        except Exception as e:
-            print_message(f"❌ Container diagnostics error: {e}", Colors.RED)
-            failed_checks += 1
+        elif status["running"]:
+            try:
+                print_message("\n🐳 Container Diagnostics:", Colors.BLUE)
+                total_checks += 1
+
+                if container_name:
+                    # One listing serves both the existence check and the details
+                    rows = probes["rows"].result()
+
+                    if rows:
+                        print_message("✅ Container is running", Colors.GREEN)
+
+                        # Show container details
+                        print_message("\n📊 Container Details:", Colors.YELLOW)
+                        print("NAMES\tSTATUS\tIMAGE\tPORTS")
+                        for row in rows:
+                            print(
+                                f"{row.get('Names', '')}\t{row.get('Status', '')}\t"
+                                f"{row.get('Image', '')}\t{row.get('Ports', '')}"
+                            )
+
+                        # Show resource usage
+                        print_message("\n💻 Resource Usage:", Colors.YELLOW)
+                        _print_resource_usage(container_name, probes["usage"].result())
+                    else:
+                        print_message("❌ Container is not running", Colors.RED)
+                        failed_checks += 1
+
+            except Exception as e:
+                print_message(f"❌ Container diagnostics error: {e}", Colors.RED)
+                failed_checks += 1
 
     # === FINAL SUMMARY ===
     print_message("\n📋 Status Summary:", Colors.BLUE)
@@ -427,18 +454,21 @@ def action_logs(follow: bool = False, lines: int = 50) -> bool:
 
     print_message(f"📋 Bot Logs (last {lines} lines):", Colors.BLUE)
 
-    cmd = [
-        "docker-compose",
-        "-f",
-        "docker/docker-compose.yml",
-        "logs",
-        "--tail",
-        str(lines),
-    ]
+    cmd = compose_command("logs", "--tail", str(lines))
     if follow:
-        cmd.append("-f")
+        cmd.extend(["-f", "bot"])
+        # Hand the terminal over to docker-compose instead of keeping this
+        # Python process alive for the whole follow session
+        debug_print(f"Executing: {' '.join(cmd)}")
+        sys.stdout.flush()
+        try:
+            os.execvp(cmd[0], cmd)
+        except OSError as e:
+            print_error(f"Failed to follow logs: {e}")
+            return False
     cmd.append("bot")
 
+    # stdout is inherited, so compose writes straight to the terminal
     try:
         subprocess.run(cmd, check=False, capture_output=False)
         return True
@@ -489,14 +519,7 @@ def action_prune(confirm: bool = False) -> bool:
         # Stop everything
         print_message("Stopping all services...", Colors.YELLOW)
         subprocess.run(
-            [
-                "docker-compose",
-                "-f",
-                "docker/docker-compose.yml",
-                "down",
-                "-v",
-                "--remove-orphans",
-            ],
+            compose_command("down", "-v", "--remove-orphans"),
             check=False,
             capture_output=False,
         )
@@ -515,16 +538,12 @@ def action_prune(confirm: bool = False) -> bool:
                 check=False,
             )
 
-            if result.stdout.strip():
-                image_ids = result.stdout.strip().split("\n")
-                for image_id in image_ids:
-                    if image_id.strip():
-                        subprocess.run(
-                            ["docker", "rmi", "-f", image_id.strip()],
-                            capture_output=True,
-                            check=False,
-                        )
-                        debug_print(f"Force removed Docker image: {image_id.strip()}")
+            # An image tagged several times is listed once per tag
+            image_ids = list(dict.fromkeys(result.stdout.split()))
+            if image_ids:
+                # One rmi call removes all of them in a single daemon round trip
+                run_silent(["docker", "rmi", "-f", *image_ids])
+                debug_print(f"Force removed Docker images: {', '.join(image_ids)}")
                 print_message("Force removed project Docker images", Colors.GREEN)
         except Exception as e:
             debug_print(f"Warning: Could not force remove project images: {e}")
@@ -575,7 +594,14 @@ def action_backup() -> bool:
             ".env",
         ]
 
-        result = subprocess.run(cmd, check=False, capture_output=True, text=True)
+        # Only stderr is reported, so tar's stdout is discarded unread
+        result = subprocess.run(
+            cmd,
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
         if result.returncode != 0:
             raise BotError(f"Failed to create backup: {result.stderr}")
 
@@ -5,12 +5,11 @@ This module provides argument parsers for various script operations.
 """
 
 import argparse
-import getpass
 import os
 import re
 
 from .errors import ConfigError
-from .output import Colors, print_error, print_message
+from .output import Colors, print_error, print_message, refresh_debug_mode
 
 
 def validate_token(token: str) -> bool:
@@ -30,6 +29,9 @@ def prompt_for_token() -> str:
     print_message("Please enter your Telegram bot token from @BotFather", Colors.YELLOW)
     print_message("Format: 123456789:ABCdefGHIjklMNOpqrsTUVwxyz", Colors.CYAN)
 
+    # Only needed for interactive setup; imports termios among others
+    import getpass
+
     while True:
         token = getpass.getpass("Bot Token: ").strip()
 
@@ -114,7 +116,7 @@ def parse_and_setup_args(parser: argparse.ArgumentParser) -> argparse.Namespace:
     args = parser.parse_args()
 
     # Load .env file first to get environment variables
-    from .environment import load_env
+    from .environment import is_dry_run, load_env
 
     load_env()
 
@@ -123,10 +125,12 @@ def parse_and_setup_args(parser: argparse.ArgumentParser) -> argparse.Namespace:
         os.environ["DEBUG"] = "1"
     if hasattr(args, "verbose") and args.verbose:
         os.environ["VERBOSE"] = "1"
+    refresh_debug_mode()
 
     # Setup dry-run mode
     if hasattr(args, "dry_run") and args.dry_run:
         os.environ["DRY_RUN"] = "1"
+        is_dry_run.cache_clear()
 
     # Handle token setup for run script
     if hasattr(args, "token") and parser.prog and "run" in parser.prog:
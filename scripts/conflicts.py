@@ -7,12 +7,16 @@ such as port conflicts, token conflicts, and resource conflicts.
 
 import os
 import socket
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
 
-from .docker_utils import run_command
+from .docker_utils import is_docker_daemon_running, run_command, ttl_cache
 from .environment import get_system_name
 from .output import Colors, debug_print, print_error, print_message, print_warning
 
+# Seconds one container listing is shared by the conflict checks
+CONTAINER_LISTING_TTL = 5.0
+
 
 def check_port_conflict(port: int) -> bool:
     """Check if a port is already in use"""
@@ -67,8 +71,30 @@ def find_process_using_port(port: int) -> Optional[Dict[str, Any]]:
     return None
 
 
-def check_telegram_token_conflict() -> bool:
-    """Check for Telegram bot token conflicts"""
+@ttl_cache(CONTAINER_LISTING_TTL)
+def _list_containers() -> Optional[Tuple[Tuple[str, bool], ...]]:
+    """List all container names with their running flag
+
+    Returns None when Docker cannot be queried.
+    """
+    result = run_command(["docker", "ps", "-a", "--format", "{{.Names}}|{{.State}}"])
+    if result.returncode != 0:
+        return None
+
+    containers = []
+    for line in result.stdout.split("\n"):
+        name, _, state = line.strip().partition("|")
+        if name:
+            containers.append((name, state == "running"))
+    return tuple(containers)
+
+
+def check_telegram_token_conflict(system_name: Optional[str] = None) -> bool:
+    """Check for Telegram bot token conflicts
+
+    ``system_name`` skips the environment lookup when the caller already
+    resolved it.
+    """
     debug_print("Checking for Telegram token conflicts")
 
     bot_token = os.getenv("BOT_TOKEN")
@@ -77,13 +103,14 @@ def check_telegram_token_conflict() -> bool:
         return False
 
     # Check if any other containers might be using the same token
-    result = run_command(["docker", "ps", "--format", "{{.Names}}"])
-    if result.returncode != 0:
+    listing = _list_containers()
+    if listing is None:
         debug_print("Could not list Docker containers")
         return False
 
-    system_name = get_system_name()
-    containers = [name.strip() for name in result.stdout.split("\n") if name.strip()]
+    if system_name is None:
+        system_name = get_system_name()
+    containers = [name for name, running in listing if running]
 
     # Look for other bot containers
     bot_containers = [
@@ -104,18 +131,23 @@ def check_telegram_token_conflict() -> bool:
     return False
 
 
-def check_docker_name_conflict() -> bool:
-    """Check for Docker container/image name conflicts"""
+def check_docker_name_conflict(system_name: Optional[str] = None) -> bool:
+    """Check for Docker container/image name conflicts
+
+    ``system_name`` skips the environment lookup when the caller already
+    resolved it.
+    """
     debug_print("Checking for Docker name conflicts")
 
-    system_name = get_system_name()
+    if system_name is None:
+        system_name = get_system_name()
 
     # Check for containers with similar names
-    result = run_command(["docker", "ps", "-a", "--format", "{{.Names}}"])
-    if result.returncode != 0:
+    listing = _list_containers()
+    if listing is None:
         return False
 
-    containers = [name.strip() for name in result.stdout.split("\n") if name.strip()]
+    containers = [name for name, _ in listing]
 
     # Look for containers with similar names
     similar_containers = []
@@ -141,20 +173,18 @@ def check_file_conflicts() -> bool:
 
     conflicts = []
 
-    # Check for important files
-    important_files = [".env", "docker-compose.yml", "Dockerfile"]
-    for file_name in important_files:
-        if os.path.exists(file_name):
-            # Check if file is writable
-            if not os.access(file_name, os.W_OK):
-                conflicts.append(f"{file_name} is not writable")
-
-    # Check for data directories
-    important_dirs = ["data", "logs"]
-    for dir_name in important_dirs:
-        if os.path.exists(dir_name):
-            if not os.access(dir_name, os.W_OK):
-                conflicts.append(f"{dir_name}/ directory is not writable")
+    # Check important files and data directories are writable. os.access
+    # also fails for missing paths, so existence is only checked on failure.
+    important_paths = [
+        (".env", ".env"),
+        ("docker-compose.yml", "docker-compose.yml"),
+        ("Dockerfile", "Dockerfile"),
+        ("data", "data/ directory"),
+        ("logs", "logs/ directory"),
+    ]
+    for path, label in important_paths:
+        if not os.access(path, os.W_OK) and os.path.exists(path):
+            conflicts.append(f"{label} is not writable")
 
     if conflicts:
         debug_print(f"Found file conflicts: {conflicts}")
@@ -173,8 +203,7 @@ def check_docker_conflicts() -> bool:
     conflicts = False
 
     # Check Docker daemon
-    result = run_command(["docker", "info"])
-    if result.returncode != 0:
+    if not is_docker_daemon_running():
         print_error("Docker daemon is not running or accessible")
         return True
 
@@ -231,18 +260,25 @@ def detect_all_conflicts() -> Dict[str, bool]:
 
     print_message("🔍 Checking for conflicts...", Colors.BLUE)
 
-    conflicts = {
-        "telegram_token": check_telegram_token_conflict(),
-        "docker_names": check_docker_name_conflict(),
-        "file_permissions": check_file_conflicts(),
-        "docker_resources": check_docker_conflicts(),
-        "environment": check_environment_conflicts(),
-    }
-
-    # Check common ports
+    # Port probes print nothing, so they run in the background while the
+    # other checks report in order
     common_ports = [80, 443, 8080, 3000, 5000]
-    port_conflicts = any(check_port_conflict(port) for port in common_ports)
-    conflicts["ports"] = port_conflicts
+    with ThreadPoolExecutor(max_workers=len(common_ports)) as executor:
+        port_futures = [
+            executor.submit(check_port_conflict, port) for port in common_ports
+        ]
+
+        system_name = get_system_name()
+        conflicts = {
+            "telegram_token": check_telegram_token_conflict(system_name),
+            "docker_names": check_docker_name_conflict(system_name),
+            "file_permissions": check_file_conflicts(),
+            "docker_resources": check_docker_conflicts(),
+            "environment": check_environment_conflicts(),
+        }
+
+        # Check common ports
+        conflicts["ports"] = any(future.result() for future in port_futures)
 
     total_conflicts = sum(conflicts.values())
 
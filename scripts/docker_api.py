@@ -0,0 +1,176 @@
+"""
+docker_api.py - Minimal Docker Engine API client
+
+This module queries the Docker daemon directly over its unix socket using
+only the standard library, so frequent lookups do not spawn the docker CLI.
+Each thread keeps one keep-alive connection, so repeated lookups are single
+HTTP requests. All helpers return None when the API is unreachable; callers
+fall back to the CLI in that case.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from .output import debug_print
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+API_TIMEOUT = 5.0
+
+# Per-thread persistent connection to the daemon
+_local = threading.local()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a unix domain socket"""
+
+    def __init__(self, socket_path: str, timeout: float = API_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def get_socket_path() -> Optional[str]:
+    """Get the Docker daemon socket path if it is a local unix socket"""
+    docker_host = os.getenv("DOCKER_HOST", "")
+    if docker_host:
+        if not docker_host.startswith("unix://"):
+            debug_print(f"DOCKER_HOST is not a unix socket: {docker_host}")
+            return None
+        socket_path = docker_host[len("unix://") :]
+    else:
+        socket_path = DEFAULT_DOCKER_SOCKET
+
+    if not os.path.exists(socket_path):
+        debug_print(f"Docker socket not found: {socket_path}")
+        return None
+    return socket_path
+
+
+def _get_connection(socket_path: str) -> _UnixHTTPConnection:
+    """Get this thread's connection to the daemon, creating it if needed"""
+    conn = getattr(_local, "conn", None)
+    if conn is None or conn.socket_path != socket_path:
+        if conn is not None:
+            conn.close()
+        conn = _UnixHTTPConnection(socket_path)
+        _local.conn = conn
+    return conn
+
+
+def _request(socket_path: str, path: str) -> Tuple[int, bytes]:
+    """GET a path over the persistent connection and return status and body
+
+    A request on a reused connection the daemon has already closed is
+    retried once on a fresh one. On any other error the connection is
+    dropped and the exception propagates.
+    """
+    conn = _get_connection(socket_path)
+    reused = conn.sock is not None
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+        conn.close()
+        if not reused:
+            raise
+    except BaseException:
+        conn.close()
+        raise
+
+    debug_print("Docker API connection was closed, reconnecting")
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.read()
+    except BaseException:
+        conn.close()
+        raise
+
+
+def api_get(path: str) -> Optional[Any]:
+    """GET a Docker Engine API endpoint and decode its JSON response"""
+    socket_path = get_socket_path()
+    if not socket_path:
+        return None
+
+    debug_print(f"Docker API request: GET {path}")
+    try:
+        status, body = _request(socket_path, path)
+        if status != 200:
+            debug_print(f"Docker API returned {status} for {path}")
+            return None
+        return json.loads(body)
+    except (OSError, http.client.HTTPException, ValueError) as e:
+        debug_print(f"Docker API request failed: {path}, error: {e}")
+        return None
+
+
+def ping() -> Optional[bool]:
+    """Check whether the Docker daemon answers on its socket
+
+    Returns None when the socket cannot be used from this process (missing
+    or not permitted), so callers can fall back to the docker CLI.
+    """
+    socket_path = get_socket_path()
+    if not socket_path:
+        return None
+
+    try:
+        status, _ = _request(socket_path, "/_ping")
+        return status == 200
+    except PermissionError as e:
+        debug_print(f"Docker socket not accessible: {e}")
+        return None
+    except (OSError, http.client.HTTPException) as e:
+        debug_print(f"Docker daemon ping failed: {e}")
+        return False
+
+
+def list_containers(
+    filters: Dict[str, List[str]], include_stopped: bool = False
+) -> Optional[List[Dict[str, Any]]]:
+    """List containers matching Docker API filters (``docker ps --filter``)"""
+    query = {"filters": json.dumps(filters)}
+    if include_stopped:
+        query["all"] = "1"
+    return api_get(f"/containers/json?{urlencode(query)}")
+
+
+def inspect_container(container: str) -> Optional[Dict[str, Any]]:
+    """Inspect a container by name or ID"""
+    return api_get(f"/containers/{quote(container, safe='')}/json")
+
+
+def get_container_health(container: str) -> Optional[str]:
+    """Get the healthcheck status of a container
+
+    Returns an empty string for containers without a healthcheck and None
+    when the Docker API is unavailable or the container does not exist.
+    """
+    info = inspect_container(container)
+    if info is None:
+        return None
+    health = info.get("State", {}).get("Health") or {}
+    return health.get("Status", "")
+
+
+def get_container_stats(container: str) -> Optional[Dict[str, Any]]:
+    """Get a single resource usage snapshot of a running container
+
+    ``one-shot`` makes the daemon return raw counters immediately instead
+    of sampling twice with a one second pause as ``docker stats`` does.
+    """
+    return api_get(
+        f"/containers/{quote(container, safe='')}/stats?stream=false&one-shot=true"
+    )
@@ -5,40 +5,180 @@ This module provides functions for Docker installation checks,
 daemon management, and container operations.
 """
 
+import json
 import os
-import platform
+import re
+import shutil
 import subprocess
-from typing import Any, Dict, List, Optional
-
-from .environment import get_system_name
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .docker_api import (
+    get_container_health,
+    get_container_stats,
+    inspect_container,
+    list_containers,
+    ping,
+)
+from .environment import get_system_name, is_dry_run
 from .output import Colors, debug_print, print_error, print_message, print_warning
 
+T = TypeVar("T")
+
+COMPOSE_FILE = "docker/docker-compose.yml"
+
+# Container status results are reused for this long (seconds) so that status
+# composition and readiness polling do not re-query Docker back to back
+CONTAINER_STATUS_TTL = 1.0
+
+# Delay between the two stats snapshots used to compute CPU usage
+_CPU_SAMPLE_INTERVAL = 0.1
+_CGROUP_ROOT = Path("/sys/fs/cgroup")
+_previous_stats: Dict[str, Dict[str, Any]] = {}
+
+# Set once check_docker_installation() has succeeded in this process
+_docker_ready = False
+
+# Absolute paths of executables already found on PATH
+_executable_paths: Dict[str, str] = {}
+
+
+def ttl_cache(seconds: float) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Memoize a function's results for a limited time
+
+    Results are keyed by the call arguments. Calls are serialized, so
+    concurrent misses run the function once. The wrapper gains a
+    ``cache_clear()`` method, like ``functools.lru_cache``.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        entries: Dict[Any, Tuple[float, T]] = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                now = time.monotonic()
+                cached = entries.get(key)
+                if cached and now - cached[0] < seconds:
+                    debug_print(f"Using cached result of {func.__name__}")
+                    return cached[1]
+                result = func(*args, **kwargs)
+                entries[key] = (now, result)
+                return result
+
+        wrapper.cache_clear = entries.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def _resolve_argv(cmd: List[str]) -> List[str]:
+    """Replace a bare executable name with its absolute path
+
+    With an absolute path the child execs directly instead of searching
+    PATH, and CPython can start it with posix_spawn/vfork rather than a
+    full fork. Lookups are remembered; misses are retried on the next call.
+
+    Raises FileNotFoundError for an executable that is not on PATH, so a
+    missing ``docker`` fails without spawning a process at all.
+    """
+    name = cmd[0] if cmd else ""
+    if not name or os.sep in name:
+        return cmd
+    path = _executable_paths.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is None:
+            raise FileNotFoundError(f"{name}: command not found")
+        _executable_paths[name] = path
+    return [path, *cmd[1:]]
+
 
 def run_command(
     cmd: List[str],
     capture_output: bool = True,
+    text: bool = True,
 ) -> subprocess.CompletedProcess:
-    """Run a command and return the result"""
+    """Run a command and return the result
+
+    With ``text=False`` the output is returned as raw bytes, which avoids
+    decoding large outputs that are only scanned for ASCII markers.
+    """
     try:
         debug_print(f"Running command: {' '.join(cmd)}")
         return subprocess.run(
-            cmd,
+            _resolve_argv(cmd),
             capture_output=capture_output,
-            text=True,
+            text=text,
             check=False,
         )
     except Exception as e:
         debug_print(f"Command failed: {' '.join(cmd)}, error: {e}")
-        return subprocess.CompletedProcess(cmd, 1, "", str(e))
+        if text:
+            return subprocess.CompletedProcess(cmd, 1, "", str(e))
+        return subprocess.CompletedProcess(cmd, 1, b"", str(e).encode())
+
+
+def run_silent(cmd: List[str]) -> int:
+    """Run a command for its exit status only
+
+    Output goes to /dev/null, so no pipes are created and nothing is read
+    back or decoded.
+    """
+    try:
+        debug_print(f"Running command: {' '.join(cmd)}")
+        return subprocess.run(
+            _resolve_argv(cmd),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        ).returncode
+    except Exception as e:
+        debug_print(f"Command failed: {' '.join(cmd)}, error: {e}")
+        return 1
+
+
+def is_docker_daemon_running() -> bool:
+    """Check whether the Docker daemon is reachable
+
+    Pings the API socket directly when possible. Otherwise asks the CLI
+    for the server version, which is far cheaper than ``docker info``.
+    """
+    reachable = ping()
+    if reachable is not None:
+        return reachable
+    return run_silent(["docker", "version", "--format", "{{.Server.Version}}"]) == 0
 
 
 def check_docker_installation() -> bool:
-    """Check if Docker is installed and running"""
+    """Check if Docker is installed and running
+
+    A successful check is remembered for the rest of the process; failures
+    are re-checked, since the daemon may have been started meanwhile.
+    """
+    global _docker_ready
+    if _docker_ready:
+        debug_print("Docker installation already verified")
+        return True
+
     debug_print("Checking Docker installation...")
 
+    # The CLI and daemon probes are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        version_future = executor.submit(run_silent, ["docker", "--version"])
+        daemon_future = executor.submit(is_docker_daemon_running)
+        version_returncode = version_future.result()
+        daemon_running = daemon_future.result()
+
     # Check if docker command exists
-    result = run_command(["docker", "--version"])
-    if result.returncode != 0:
+    if version_returncode != 0:
         debug_print("Docker command not found in PATH")
         print_error("Docker is not installed.")
         print_message("Please install Docker first.", Colors.YELLOW)
@@ -48,19 +188,21 @@ def check_docker_installation() -> bool:
 
     # Check if Docker daemon is running
     debug_print("Checking Docker daemon status...")
-    result = run_command(["docker", "info"])
-    if result.returncode != 0:
+    if not daemon_running:
         debug_print("Docker daemon is not responding")
         print_error("Docker daemon is not running.")
 
         # Try to start Docker based on OS
-        if platform.system() == "Darwin":
+        if sys.platform == "darwin":
             debug_print("Detected macOS, attempting to start Docker for Mac")
-            return start_docker_macos()
-        debug_print("Detected Linux, attempting to start Docker daemon")
-        return start_docker_linux()
+            _docker_ready = start_docker_macos()
+        else:
+            debug_print("Detected Linux, attempting to start Docker daemon")
+            _docker_ready = start_docker_linux()
+        return _docker_ready
 
     debug_print("Docker daemon is running and accessible")
+    _docker_ready = True
     return True
 
 
@@ -74,8 +216,7 @@ def start_docker_macos() -> bool:
         debug_print("Docker.app found, executing 'open -a Docker'")
         print_message("Found Docker.app, attempting to start it...", Colors.YELLOW)
 
-        result = run_command(["open", "-a", "Docker"])
-        if result.returncode != 0:
+        if run_silent(["open", "-a", "Docker"]) != 0:
             print_error("Failed to start Docker.app")
             return False
 
@@ -90,8 +231,7 @@ def start_docker_macos() -> bool:
             )
             debug_print(f"Testing Docker daemon connectivity (attempt {attempt})")
 
-            result = run_command(["docker", "info"])
-            if result.returncode == 0:
+            if is_docker_daemon_running():
                 debug_print("Docker daemon responded successfully")
                 print_message("Docker started successfully.", Colors.GREEN)
                 return True
@@ -119,9 +259,7 @@ def start_docker_linux() -> bool:
     print_message("Attempting to start Docker daemon...", Colors.YELLOW)
 
     debug_print("Executing: systemctl start docker.service")
-    result = run_command(["systemctl", "start", "docker.service"])
-
-    if result.returncode == 0:
+    if run_silent(["systemctl", "start", "docker.service"]) == 0:
         debug_print("systemctl start command succeeded")
 
         # Wait for Docker to start
@@ -135,8 +273,7 @@ def start_docker_linux() -> bool:
             )
             debug_print(f"Testing Docker daemon connectivity (attempt {attempt})")
 
-            result = run_command(["docker", "info"])
-            if result.returncode == 0:
+            if is_docker_daemon_running():
                 debug_print("Docker daemon responded successfully")
                 print_message("Docker started successfully.", Colors.GREEN)
                 return True
@@ -160,71 +297,231 @@ def start_docker_linux() -> bool:
 
 def check_docker() -> bool:
     """Check Docker daemon and start if needed"""
-    result = run_command(["docker", "info"])
-    if result.returncode != 0:
+    if not is_docker_daemon_running():
         print_error("Docker daemon is not running")
-        if platform.system() == "Darwin":
+        if sys.platform == "darwin":
             return start_docker_macos()
         return start_docker_linux()
     return True
 
 
-def get_container_status(container_name: Optional[str] = None) -> Dict[str, Any]:
-    """Get container status information"""
-    if not container_name:
-        container_name = get_system_name()
+def get_health_status(container: str) -> str:
+    """Get the Docker healthcheck status of a container
 
-    debug_print(f"Getting status for container: {container_name}")
+    The Docker API socket is queried directly when available, falling back
+    to ``docker inspect`` otherwise.
+    """
+    health_status = get_container_health(container)
+    if health_status is not None:
+        return health_status
+
+    result = run_command(
+        ["docker", "inspect", "--format", "{{.State.Health.Status}}", container],
+    )
+    if result.returncode != 0:
+        return ""
+    return result.stdout.strip()
+
+
+def get_health_details(container: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """Get a container's healthcheck status and probe log in one inspect
+
+    The log entries carry ``ExitCode`` and ``Output`` keys as in
+    ``docker inspect``.
+    """
+    info = inspect_container(container)
+    if info is not None:
+        health = info.get("State", {}).get("Health") or {}
+    else:
+        result = run_command(
+            ["docker", "inspect", "--format", "{{json .State.Health}}", container],
+        )
+        if result.returncode != 0:
+            return "", []
+        try:
+            health = json.loads(result.stdout) or {}
+        except ValueError:
+            return "", []
+    return health.get("Status", ""), health.get("Log") or []
+
+
+def get_service_container_id(service: str) -> str:
+    """Get the ID of the running container for a compose service"""
+    result = run_command(compose_command("ps", "-q", service))
+    return result.stdout.strip()
+
+
+def get_container_state(container: str) -> Optional[Tuple[bool, str]]:
+    """Get a container's running flag and health status in one inspect
+
+    Returns None when the container no longer exists.
+    """
+    info = inspect_container(container)
+    if info is not None:
+        state = info.get("State", {})
+        health = state.get("Health") or {}
+        return bool(state.get("Running")), health.get("Status", "")
 
-    # Check if container exists
     result = run_command(
         [
             "docker",
-            "ps",
-            "-a",
-            "--filter",
-            f"name={container_name}",
+            "inspect",
             "--format",
-            "{{.Names}}",
+            "{{.State.Running}}|{{if .State.Health}}{{.State.Health.Status}}{{end}}",
+            container,
         ],
     )
-    containers = [name for name in result.stdout.strip().split("\n") if name.strip()]
+    if result.returncode != 0:
+        return None
+    running, _, health_status = result.stdout.strip().partition("|")
+    return running == "true", health_status
+
+
+@cache
+def _detect_compose() -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """Find the Docker Compose CLI and its version, once per process
+
+    The Go ``docker compose`` plugin is preferred: it starts several times
+    faster than the legacy Python ``docker-compose``. The executable is
+    resolved to an absolute path so later calls skip the PATH search, and
+    the returned argv prefix already includes the project compose file.
+    """
+    for name, *subcommand in (("docker", "compose"), ("docker-compose",)):
+        executable = shutil.which(name)
+        if not executable:
+            continue
+        command = (executable, *subcommand)
+        result = run_command([*command, "version", "--short"])
+        if result.returncode != 0:
+            continue
+        match = re.match(r"v?(\d+)\.(\d+)(?:\.(\d+))?", result.stdout.strip())
+        version = tuple(int(part or 0) for part in match.groups()) if match else ()
+        debug_print(f"Using {' '.join(command)}, version: {version}")
+        return (*command, "-f", COMPOSE_FILE), version
+
+    debug_print("Could not determine the Docker Compose CLI")
+    return ("docker-compose", "-f", COMPOSE_FILE), ()
+
+
+def compose_command(*args: str) -> List[str]:
+    """Build a Docker Compose command line for the project compose file"""
+    return [*_detect_compose()[0], *args]
+
+
+def print_compose_ps(service: Optional[str] = None) -> None:
+    """Print the running containers of the compose project (``compose ps``)
+
+    The containers are listed through the Docker API by their compose
+    labels, which avoids starting the compose CLI just to print a table.
+    """
+    labels = [f"com.docker.compose.project={get_system_name()}"]
+    if service:
+        labels.append(f"com.docker.compose.service={service}")
+    containers = list_containers({"label": labels})
+    if containers is None:
+        args = [service] if service else []
+        subprocess.run(compose_command("ps", *args), check=False)
+        return
+
+    print(f"{'NAME':<32}{'SERVICE':<16}{'STATUS':<28}IMAGE")
+    for container in containers:
+        names = container.get("Names") or [""]
+        container_labels = container.get("Labels") or {}
+        print(
+            f"{names[0].lstrip('/'):<32}"
+            f"{container_labels.get('com.docker.compose.service', ''):<16}"
+            f"{container.get('Status', ''):<28}{container.get('Image', '')}"
+        )
+
+
+def get_compose_version() -> Tuple[int, ...]:
+    """Get the Docker Compose version as a tuple
+
+    Returns an empty tuple when the version cannot be determined.
+    """
+    return _detect_compose()[1]
+
+
+def compose_supports_wait() -> bool:
+    """Check whether ``up --wait --wait-timeout`` is available (compose 2.17+)"""
+    return get_compose_version() >= (2, 17)
+
+
+def is_service_running(service: str = "bot") -> bool:
+    """Check whether a compose service has a running container
+
+    A single targeted ``docker-compose ps`` call, much cheaper than a full
+    status query when only the running flag is needed.
+    """
+    cmd = compose_command("ps", "-q")
+    cmd.extend(["--filter", "status=running"])
+    if service != "all":
+        cmd.append(service)
+    result = run_command(cmd)
+    return result.returncode == 0 and bool(result.stdout.strip())
 
-    if not containers:
-        return {"exists": False, "running": False, "healthy": False, "containers": []}
 
-    # Check if running
+def invalidate_container_status() -> None:
+    """Drop cached container status after starting or stopping containers"""
+    _query_container_status.cache_clear()
+
+
+def get_container_status(container_name: Optional[str] = None) -> Dict[str, Any]:
+    """Get container status information
+
+    Results are cached for ``CONTAINER_STATUS_TTL`` seconds per container.
+    """
+    if not container_name:
+        container_name = get_system_name()
+    return _query_container_status(container_name)
+
+
+@ttl_cache(CONTAINER_STATUS_TTL)
+def _query_container_status(container_name: str) -> Dict[str, Any]:
+    """Query Docker for the current status of a container"""
+    debug_print(f"Getting status for container: {container_name}")
+
+    # List matching containers and their state with one structured query
     result = run_command(
         [
             "docker",
             "ps",
+            "-a",
+            "--no-trunc",
             "--filter",
             f"name={container_name}",
             "--format",
-            "{{.Names}}",
-        ],
+            "{{json .}}",
+        ]
     )
-    running_containers = [
-        name for name in result.stdout.strip().split("\n") if name.strip()
-    ]
+    containers = []
+    running_containers = []
+    container_ids = {}
+    for line in result.stdout.splitlines():
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            debug_print(f"Skipping unparsable docker ps line: {line}")
+            continue
+        containers.append(row["Names"])
+        state = row.get("State")
+        if state is None:  # Docker releases before 20.10
+            state = "running" if row["Status"].startswith("Up") else "exited"
+        if state == "running":
+            running_containers.append(row["Names"])
+            container_ids[row["Names"]] = row["ID"]
+
+    if not containers:
+        return {"exists": False, "running": False, "healthy": False, "containers": []}
 
     is_running = len(running_containers) > 0
 
     # Check health status if running
     is_healthy = False
     if is_running:
-        result = run_command(
-            [
-                "docker",
-                "inspect",
-                "--format",
-                "{{.State.Health.Status}}",
-                container_name,
-            ],
-        )
-        if result.returncode == 0:
-            health_status = result.stdout.strip()
-            is_healthy = health_status == "healthy"
+        is_healthy = get_health_status(container_name) == "healthy"
 
     return {
         "exists": True,
@@ -232,9 +529,250 @@ def get_container_status(container_name: Optional[str] = None) -> Dict[str, Any]
         "healthy": is_healthy,
         "containers": containers,
         "running_containers": running_containers,
+        "container_ids": container_ids,
     }
 
 
+def _format_size(size: float, binary: bool = False) -> str:
+    """Format a byte count the way ``docker stats`` does"""
+    if binary:
+        base, units = 1024.0, ["B", "KiB", "MiB", "GiB", "TiB"]
+    else:
+        base, units = 1000.0, ["B", "kB", "MB", "GB", "TB"]
+    for unit in units[:-1]:
+        if abs(size) < base:
+            return f"{size:.4g}{unit}"
+        size /= base
+    return f"{size:.4g}{units[-1]}"
+
+
+def _cpu_percent(previous: Dict[str, Any], current: Dict[str, Any]) -> float:
+    """Compute CPU usage between two stats snapshots like ``docker stats``"""
+    prev_cpu = previous["cpu_stats"]
+    cur_cpu = current["cpu_stats"]
+    cpu_delta = (
+        cur_cpu["cpu_usage"]["total_usage"] - prev_cpu["cpu_usage"]["total_usage"]
+    )
+    system_delta = cur_cpu.get("system_cpu_usage", 0) - prev_cpu.get(
+        "system_cpu_usage", 0
+    )
+    if cpu_delta <= 0 or system_delta <= 0:
+        return 0.0
+    online_cpus = cur_cpu.get("online_cpus") or len(
+        cur_cpu["cpu_usage"].get("percpu_usage") or [None]
+    )
+    return cpu_delta / system_delta * online_cpus * 100.0
+
+
+def _cgroup_candidates(container_id: str) -> Tuple[Path, Path]:
+    """Cgroup paths of a container, relative to a hierarchy root
+
+    The first is used with the systemd cgroup driver, the second with the
+    cgroupfs driver.
+    """
+    systemd_path = Path("system.slice", f"docker-{container_id}.scope")
+    cgroupfs_path = Path("docker", container_id)
+    return systemd_path, cgroupfs_path
+
+
+def _find_cgroup_dir(container_id: str) -> Optional[Path]:
+    """Locate the cgroup v2 directory of a container"""
+    for relative in _cgroup_candidates(container_id):
+        cgroup_dir = _CGROUP_ROOT / relative
+        if cgroup_dir.is_dir():
+            return cgroup_dir
+    return None
+
+
+def _find_cgroup_v1_dirs(container_id: str) -> Optional[Tuple[Path, Path]]:
+    """Locate the cgroup v1 memory and cpuacct directories of a container"""
+    for relative in _cgroup_candidates(container_id):
+        memory_dir = _CGROUP_ROOT / "memory" / relative
+        if memory_dir.is_dir():
+            return memory_dir, _CGROUP_ROOT / "cpuacct" / relative
+    return None
+
+
+def _stat_value(stat_text: str, wanted: str) -> int:
+    """Get one counter from a cgroup ``*.stat`` file, 0 when missing"""
+    for line in stat_text.splitlines():
+        key, _, value = line.partition(" ")
+        if key == wanted:
+            return int(value)
+    return 0
+
+
+def read_cgroup_stats(container_id: str) -> Optional[Dict[str, int]]:
+    """Read a container's memory and CPU counters from its cgroup files
+
+    Both cgroup v2 and the per-controller v1 layout are supported. Returns
+    None when the cgroup is not accessible from this host.
+    """
+    cgroup_dir = _find_cgroup_dir(container_id)
+    if cgroup_dir is None:
+        v1_dirs = _find_cgroup_v1_dirs(container_id)
+        if v1_dirs is None:
+            debug_print(f"No cgroup directory found for container {container_id}")
+            return None
+        return _read_cgroup_v1_stats(*v1_dirs)
+
+    try:
+        memory_usage = int((cgroup_dir / "memory.current").read_text())
+        memory_max = (cgroup_dir / "memory.max").read_text().strip()
+        memory_stat = (cgroup_dir / "memory.stat").read_text()
+        cpu_stat = (cgroup_dir / "cpu.stat").read_text()
+        pids = (cgroup_dir / "cgroup.procs").read_text().split()
+    except (OSError, ValueError) as e:
+        debug_print(f"Failed to read cgroup stats: {e}")
+        return None
+
+    return {
+        "memory_usage": memory_usage,
+        "memory_limit": (
+            _get_host_memory() if memory_max == "max" else int(memory_max)
+        ),
+        "inactive_file": _stat_value(memory_stat, "inactive_file"),
+        "cpu_usage_usec": _stat_value(cpu_stat, "usage_usec"),
+        "pid": int(pids[0]) if pids else 0,
+    }
+
+
+def _read_cgroup_v1_stats(
+    memory_dir: Path, cpuacct_dir: Path
+) -> Optional[Dict[str, int]]:
+    """Read container counters from cgroup v1 memory and cpuacct files"""
+    try:
+        memory_usage = int((memory_dir / "memory.usage_in_bytes").read_text())
+        memory_limit = int((memory_dir / "memory.limit_in_bytes").read_text())
+        memory_stat = (memory_dir / "memory.stat").read_text()
+        cpu_usage_ns = int((cpuacct_dir / "cpuacct.usage").read_text())
+        pids = (memory_dir / "cgroup.procs").read_text().split()
+    except (OSError, ValueError) as e:
+        debug_print(f"Failed to read cgroup v1 stats: {e}")
+        return None
+
+    return {
+        "memory_usage": memory_usage,
+        # An unlimited v1 cgroup reports a huge page-aligned limit
+        "memory_limit": min(memory_limit, _get_host_memory()),
+        "inactive_file": _stat_value(memory_stat, "total_inactive_file"),
+        "cpu_usage_usec": cpu_usage_ns // 1000,
+        "pid": int(pids[0]) if pids else 0,
+    }
+
+
+@cache
+def _get_host_memory() -> int:
+    """Get the total physical memory of the host in bytes"""
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def _read_network_io(pid: int) -> Optional[Tuple[int, int]]:
+    """Sum received and sent bytes over a process's network interfaces"""
+    try:
+        lines = Path(f"/proc/{pid}/net/dev").read_text().splitlines()[2:]
+    except OSError:
+        return None
+    received = sent = 0
+    for line in lines:
+        interface, _, counters = line.partition(":")
+        if interface.strip() == "lo":
+            continue
+        fields = counters.split()
+        received += int(fields[0])
+        sent += int(fields[8])
+    return received, sent
+
+
+def _resource_usage_from_cgroup(
+    container: str, container_id: str
+) -> Optional[Dict[str, str]]:
+    """Get resource usage from two cgroup reads ``_CPU_SAMPLE_INTERVAL`` apart"""
+    previous = read_cgroup_stats(container_id)
+    if previous is None:
+        return None
+    started = time.monotonic()
+    time.sleep(_CPU_SAMPLE_INTERVAL)
+    current = read_cgroup_stats(container_id)
+    if current is None:
+        return None
+    elapsed_usec = (time.monotonic() - started) * 1_000_000
+
+    network_io = _read_network_io(current["pid"]) if current["pid"] else None
+    if network_io is None:
+        return None
+
+    cpu_delta = current["cpu_usage_usec"] - previous["cpu_usage_usec"]
+    mem_usage = _format_size(
+        current["memory_usage"] - current["inactive_file"], binary=True
+    )
+    mem_limit = _format_size(current["memory_limit"], binary=True)
+    return {
+        "container": container,
+        "cpu_percent": f"{max(cpu_delta, 0) / elapsed_usec * 100.0:.2f}%",
+        "mem_usage": f"{mem_usage} / {mem_limit}",
+        "net_io": f"{_format_size(network_io[0])} / {_format_size(network_io[1])}",
+    }
+
+
+def get_container_resource_usage(container: str) -> Optional[Dict[str, str]]:
+    """Get formatted CPU, memory and network usage of a container
+
+    Reads the container's cgroup files directly when they are accessible,
+    otherwise asks the Docker API. Returns None when neither is available
+    so callers can fall back to ``docker stats``.
+    """
+    container_id = (
+        get_container_status(container).get("container_ids", {}).get(container)
+    )
+    if container_id:
+        usage = _resource_usage_from_cgroup(container, container_id)
+        if usage:
+            return usage
+    return _resource_usage_from_api(container)
+
+
+def _resource_usage_from_api(container: str) -> Optional[Dict[str, str]]:
+    """Get resource usage from one-shot Docker API stats snapshots
+
+    Two samples are taken ``_CPU_SAMPLE_INTERVAL`` apart the first time a
+    container is queried.
+    """
+    previous = _previous_stats.get(container)
+    if previous is None:
+        previous = get_container_stats(container)
+        if previous is None:
+            return None
+        time.sleep(_CPU_SAMPLE_INTERVAL)
+
+    current = get_container_stats(container)
+    if current is None:
+        return None
+    _previous_stats[container] = current
+
+    try:
+        memory = current["memory_stats"]
+        memory_details = memory.get("stats", {})
+        # Page cache is not counted, matching docker stats (cgroup v2 / v1 keys)
+        cache_bytes = memory_details.get(
+            "inactive_file", memory_details.get("total_inactive_file", 0)
+        )
+        networks = (current.get("networks") or {}).values()
+        received = sum(network["rx_bytes"] for network in networks)
+        sent = sum(network["tx_bytes"] for network in networks)
+        mem_usage = _format_size(memory["usage"] - cache_bytes, binary=True)
+        mem_limit = _format_size(memory["limit"], binary=True)
+        return {
+            "container": current.get("name", container).lstrip("/"),
+            "cpu_percent": f"{_cpu_percent(previous, current):.2f}%",
+            "mem_usage": f"{mem_usage} / {mem_limit}",
+            "net_io": f"{_format_size(received)} / {_format_size(sent)}",
+        }
+    except (KeyError, TypeError) as e:
+        debug_print(f"Unexpected container stats payload: {e}")
+        return None
+
+
 def cleanup_project_dangling_images(verbose: bool = True) -> bool:
     """Clean up dangling Docker images belonging only to this project"""
     debug_print("Starting project-specific dangling images cleanup")
@@ -351,7 +889,7 @@ def cleanup_project_dangling_images(verbose: bool = True) -> bool:
 
         # Remove project-specific dangling images
         if project_dangling_list:
-            result = run_command(["docker", "rmi"] + project_dangling_list)
+            result = run_command(["docker", "rmi", *project_dangling_list])
             if result.returncode == 0:
                 if verbose:
                     print_message(
@@ -393,7 +931,22 @@ def auto_cleanup_images_before_build() -> bool:
 
 
 def cleanup_docker_resources(service: str = "", cleanup_all: bool = False) -> bool:
-    """Clean up Docker resources"""
+    """Clean up Docker resources
+
+    In dry-run mode nothing is listed or removed; Docker is not queried.
+    """
+    if is_dry_run():
+        target = f"service {service}" if service else "all services"
+        print_message(
+            f"DRY RUN: Would remove containers and images of {target}",
+            Colors.YELLOW,
+        )
+        if cleanup_all:
+            print_message(
+                "DRY RUN: Would remove volumes and orphan containers", Colors.YELLOW
+            )
+        return True
+
     print_message("Cleaning up Docker resources...", Colors.YELLOW)
     success = True
 
@@ -402,54 +955,46 @@ def cleanup_docker_resources(service: str = "", cleanup_all: bool = False) -> bo
         print_message("Stopping and removing containers...", Colors.YELLOW)
         if service:
             run_command(
-                [
-                    "docker-compose",
-                    "-f",
-                    "docker/docker-compose.yml",
-                    "rm",
-                    "-sf",
-                    service,
-                ],
+                compose_command("rm", "-sf", service),
             )
         else:
-            run_command(["docker-compose", "-f", "docker/docker-compose.yml", "down"])
+            run_command(compose_command("down"))
+        invalidate_container_status()
 
         # Remove images
         print_message("Removing Docker images...", Colors.YELLOW)
-        if service:
-            result = run_command(
-                [
-                    "docker-compose",
-                    "-f",
-                    "docker/docker-compose.yml",
-                    "images",
-                    "-q",
-                    service,
-                ],
-            )
-            if result.stdout.strip():
-                images = result.stdout.strip().split("\n")
-                run_command(["docker", "rmi"] + images)
+        system_name = get_system_name()
+        if system_name and get_compose_version() >= (2,):
+            # Compose v2 labels the images it builds, so the daemon can
+            # select and remove project images in one call
+            prune_cmd = [
+                "docker",
+                "image",
+                "prune",
+                "-af",
+                "--filter",
+                f"label=com.docker.compose.project={system_name}",
+            ]
+            if service:
+                prune_cmd.extend(
+                    ["--filter", f"label=com.docker.compose.service={service}"]
+                )
+            run_command(prune_cmd)
         else:
-            result = run_command(
-                ["docker-compose", "-f", "docker/docker-compose.yml", "images", "-q"],
-            )
-            if result.stdout.strip():
-                images = result.stdout.strip().split("\n")
-                run_command(["docker", "rmi"] + images)
+            # docker-compose v1 does not label images; ask compose for them
+            images_cmd = compose_command("images", "-q")
+            if service:
+                images_cmd.append(service)
+            result = run_command(images_cmd)
+            images = result.stdout.split()
+            if images:
+                run_command(["docker", "rmi", *images])
 
         # Additional cleanup if requested
         if cleanup_all:
             print_message("Cleaning up unused Docker resources...", Colors.YELLOW)
             run_command(
-                [
-                    "docker-compose",
-                    "-f",
-                    "docker/docker-compose.yml",
-                    "down",
-                    "-v",
-                    "--remove-orphans",
-                ],
+                compose_command("down", "-v", "--remove-orphans"),
             )
 
         print_message("Docker cleanup completed.", Colors.GREEN)
@@ -6,35 +6,67 @@ environment variables and configuration.
 """
 
 import os
+import re
+from functools import cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
-from .output import Colors, debug_print, print_error, print_message
+from .output import (
+    Colors,
+    debug_print,
+    print_error,
+    print_message,
+    refresh_debug_mode,
+)
+
+# KEY=value assignments in a .env file; comments and blank lines never match
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*(?:export[ \t]+)?([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.M
+)
+
+# Loaded .env files: absolute path -> ((mtime_ns, size), variables)
+_env_file_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+
+
+def _parse_env(text: str) -> Dict[str, str]:
+    """Parse .env file contents, stripping quotes around values
+
+    A key is everything before the first ``=``, minus an optional
+    ``export`` prefix; lines starting with ``#`` are comments.
+    """
+    return {key: value.strip("\"'") for key, value in _ENV_LINE_RE.findall(text)}
 
 
 def load_env(env_file: str = ".env") -> Dict[str, str]:
-    """Load environment variables from .env file"""
-    env_vars = {}
+    """Load environment variables from .env file
+
+    A file that has not changed since it was last loaded is not parsed or
+    applied again; the previously loaded variables are returned.
+    """
     env_path = Path(env_file)
 
-    if env_path.exists():
-        debug_print(f"Loading environment from {env_file}")
-        with open(env_path) as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    try:
-                        key, value = line.split("=", 1)
-                        key = key.strip()
-                        value = value.strip().strip("\"'")
-                        env_vars[key] = value
-                        os.environ[key] = value
-                        debug_print(f"Loaded {key} from .env")
-                    except ValueError:
-                        debug_print(f"Invalid line {line_num} in {env_file}: {line}")
-    else:
+    try:
+        file_stat = os.stat(env_path)
+    except OSError:
         debug_print(f"Environment file {env_file} not found")
-
+        return {}
+
+    cache_key = os.path.abspath(env_file)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+    cached = _env_file_cache.get(cache_key)
+    if cached and cached[0] == file_version:
+        debug_print(f"Environment from {env_file} already loaded")
+        return dict(cached[1])
+
+    debug_print(f"Loading environment from {env_file}")
+    env_vars = _parse_env(env_path.read_text())
+    os.environ.update(env_vars)
+    debug_print(f"Loaded {', '.join(env_vars)} from {env_file}")
+    # The file may have set DEBUG, VERBOSE or DRY_RUN
+    refresh_debug_mode()
+    is_dry_run.cache_clear()
+
+    _env_file_cache[cache_key] = (file_version, dict(env_vars))
     return env_vars
 
 
@@ -69,15 +101,11 @@ def check_bot_token() -> bool:
     env_path = Path(".env")
     if env_path.exists():
         debug_print(".env file found, checking for BOT_TOKEN")
-        with open(env_path) as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("BOT_TOKEN="):
-                    token_value = line.split("=", 1)[1].strip().strip("\"'")
-                    if token_value and token_value != "your_telegram_bot_token_here":
-                        debug_print("Valid BOT_TOKEN found in .env file")
-                        os.environ["BOT_TOKEN"] = token_value
-                        return True
+        token_value = _parse_env(env_path.read_text()).get("BOT_TOKEN")
+        if token_value and token_value != "your_telegram_bot_token_here":
+            debug_print("Valid BOT_TOKEN found in .env file")
+            os.environ["BOT_TOKEN"] = token_value
+            return True
 
     debug_print("BOT_TOKEN not found or invalid")
     print_error("BOT_TOKEN environment variable is not set or invalid.")
@@ -110,8 +138,13 @@ def check_system_name() -> bool:
     return True
 
 
+@cache
 def is_dry_run() -> bool:
-    """Check if we're in dry-run mode"""
+    """Check if we're in dry-run mode
+
+    The result is cached; code that sets DRY_RUN must call
+    ``is_dry_run.cache_clear()``.
+    """
     return os.getenv("DRY_RUN", "0") == "1"
 
 
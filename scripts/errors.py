@@ -6,7 +6,7 @@ for the bot management system.
 """
 
 import sys
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 
 from .output import debug_print, print_error, print_warning
 
@@ -59,30 +59,51 @@ class ServiceError(BotError):
         super().__init__(message, code, details)
 
 
-def handle_error(error: Exception, exit_on_error: bool = True) -> None:
-    """Handle and display errors appropriately"""
-    debug_print(f"Handling error: {type(error).__name__}: {error}")
+def _handle_bot_error(error: BotError, exit_on_error: bool) -> None:
+    """Display a BotError and exit with its code"""
+    print_error(f"❌ {error.message}")
+    if error.details:
+        print_error(f"   {error.details}")
+
+    if exit_on_error:
+        debug_print(f"Exiting with code {error.code}")
+        sys.exit(error.code)
+
+
+def _handle_keyboard_interrupt(error: KeyboardInterrupt, exit_on_error: bool) -> None:
+    """Report a user cancellation"""
+    print_warning("\n🛑 Operation cancelled by user")
+    if exit_on_error:
+        sys.exit(130)  # Standard exit code for SIGINT
+
 
-    if isinstance(error, BotError):
-        print_error(f"❌ {error.message}")
-        if error.details:
-            print_error(f"   {error.details}")
+def _handle_unexpected_error(error: BaseException, exit_on_error: bool) -> None:
+    """Report an error that is not part of the BotError hierarchy"""
+    print_error(f"❌ Unexpected error: {error}")
+    debug_print(f"Error type: {type(error)}")
 
-        if exit_on_error:
-            debug_print(f"Exiting with code {error.code}")
-            sys.exit(error.code)
+    if exit_on_error:
+        sys.exit(1)
 
-    elif isinstance(error, KeyboardInterrupt):
-        print_warning("\n🛑 Operation cancelled by user")
-        if exit_on_error:
-            sys.exit(130)  # Standard exit code for SIGINT
 
-    else:
-        print_error(f"❌ Unexpected error: {error}")
-        debug_print(f"Error type: {type(error)}")
+# Handlers keyed by exception class; subclasses resolve through their MRO
+_ERROR_HANDLERS: Dict[type, Callable[[Any, bool], None]] = {
+    BotError: _handle_bot_error,
+    KeyboardInterrupt: _handle_keyboard_interrupt,
+}
+
+
+def handle_error(error: Exception, exit_on_error: bool = True) -> None:
+    """Handle and display errors appropriately"""
+    debug_print(f"Handling error: {type(error).__name__}: {error}")
+
+    for cls in type(error).__mro__:
+        handler = _ERROR_HANDLERS.get(cls)
+        if handler is not None:
+            handler(error, exit_on_error)
+            return
 
-        if exit_on_error:
-            sys.exit(1)
+    _handle_unexpected_error(error, exit_on_error)
 
 
 class ErrorContext:
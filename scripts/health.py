@@ -5,23 +5,138 @@ This module provides functions for checking container health,
 bot operational status, and system monitoring.
 """
 
-import subprocess
-from typing import Any, Dict
-
-from .docker_utils import run_command
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from .docker_utils import (
+    compose_command,
+    get_container_state,
+    get_health_details,
+    get_service_container_id,
+    is_service_running,
+    print_compose_ps,
+    run_command,
+    ttl_cache,
+)
 from .environment import get_system_name
 from .output import Colors, debug_print, print_error, print_message
 
+# Log markers of a Telegram getUpdates conflict (another instance polling).
+# Logs are scanned as raw bytes, so the markers are bytes as well.
+_CONFLICT_PHRASES = (
+    b"telegram.error.Conflict",
+    b'error_code":409',
+    b"terminated by other getUpdates",
+)
+_API_OK_MARKER = b'"HTTP/1.1 200 OK"'
+# Error-level records in bot logs, matched as whole words
+_LOG_ERROR_RE = re.compile(rb"\b(?:ERROR|CRITICAL)\b")
 
-def is_bot_healthy() -> bool:
-    """Check if bot is healthy using Docker healthcheck"""
-    debug_print("Starting is_bot_healthy check")
+# Largest log tail shown by check_bot_status; smaller tails are sliced from it
+_STATUS_LOG_TAIL = 25
 
-    # Get container ID
+# Seconds check_bot_status waits for the healthcheck: the old 29 waits of 5s
+_HEALTH_WAIT_BUDGET = 145.0
+
+# Seconds a quick_health_check result stays valid
+QUICK_HEALTH_CHECK_TTL = 2.0
+
+# Log lines scanned for operational markers and for recent errors
+_OPERATIONAL_LOG_TAIL = 50
+_ERROR_LOG_TAIL = 10
+
+
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """Bot container state probed once and shared by the status checks"""
+
+    container_id: str = ""
+    process_running: bool = False
+    # Last log lines of the container, stdout followed by stderr
+    logs: bytes = b""
+    recent_errors: bool = False
+
+    @property
+    def container_running(self) -> bool:
+        return bool(self.container_id)
+
+
+def _has_recent_errors(stream: bytes) -> bool:
+    """Check the last lines of a log stream for error-level records"""
+    return bool(
+        _LOG_ERROR_RE.search(b"\n".join(stream.splitlines()[-_ERROR_LOG_TAIL:]))
+    )
+
+
+def capture_health_snapshot() -> HealthSnapshot:
+    """Probe the bot container once for all status checks
+
+    The process lookup and the log fetch are independent, so they run
+    concurrently once the container ID is known.
+    """
+    debug_print("Capturing bot health snapshot")
+
+    container_id = get_service_container_id("bot")
+    if not container_id:
+        debug_print("Container is not running - no container ID found")
+        return HealthSnapshot()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        process_future = executor.submit(
+            run_command,
+            ["docker", "exec", container_id, "pgrep", "-f", "python.*src[/.]bot"],
+        )
+        logs_future = executor.submit(
+            run_command,
+            ["docker", "logs", "--tail", str(_OPERATIONAL_LOG_TAIL), container_id],
+            text=False,
+        )
+        process_result = process_future.result()
+        logs_result = logs_future.result()
+
+    return HealthSnapshot(
+        container_id=container_id,
+        process_running=process_result.returncode == 0,
+        logs=logs_result.stdout + logs_result.stderr,
+        recent_errors=_has_recent_errors(logs_result.stdout)
+        or _has_recent_errors(logs_result.stderr),
+    )
+
+
+def _fetch_bot_logs(tail: int = _STATUS_LOG_TAIL) -> List[str]:
+    """Fetch the last log lines of the bot service"""
     result = run_command(
-        ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "-q", "bot"],
+        compose_command("logs", "--tail", str(tail), "bot"),
     )
-    container_id = result.stdout.strip()
+    return (result.stdout + result.stderr).splitlines()
+
+
+def _print_log_tail(lines: List[str], count: int) -> None:
+    """Print the last ``count`` lines of previously fetched logs"""
+    if lines:
+        print("\n".join(lines[-count:]))
+
+
+def _print_last_health_output(entries: Iterable[Dict[str, Any]]) -> None:
+    """Print the last output line of the given health check log entries"""
+    output = "".join(entry.get("Output", "") for entry in entries).strip()
+    if output:
+        print(output.split("\n")[-1])  # Last line
+
+
+def is_bot_healthy(container_id: Optional[str] = None) -> bool:
+    """Check if bot is healthy using Docker healthcheck
+
+    ``container_id`` skips the compose lookup when the caller already
+    resolved the bot container.
+    """
+    debug_print("Starting is_bot_healthy check")
+
+    # Get container ID
+    if container_id is None:
+        container_id = get_service_container_id("bot")
 
     debug_print(f"Container ID: {container_id}")
 
@@ -30,11 +145,8 @@ def is_bot_healthy() -> bool:
         print_error("Container is not running")
         return False
 
-    # Get container health status
-    result = run_command(
-        ["docker", "inspect", "--format", "{{.State.Health.Status}}", container_id],
-    )
-    health_status = result.stdout.strip()
+    # Get container health status and probe log in one inspect
+    health_status, health_log = get_health_details(container_id)
 
     debug_print(f"Container health status: {health_status}")
 
@@ -42,19 +154,11 @@ def is_bot_healthy() -> bool:
         debug_print("Container health check passed")
         print_message("Bot is healthy - container health check passed", Colors.GREEN)
 
-        # Print the most recent health check log
+        # Print the most recent successful health check log
         print_message("Last health check result:", Colors.YELLOW)
-        result = run_command(
-            [
-                "docker",
-                "inspect",
-                "--format",
-                "{{range .State.Health.Log}}{{if eq .ExitCode 0}}{{.Output}}{{end}}{{end}}",
-                container_id,
-            ],
+        _print_last_health_output(
+            entry for entry in health_log if entry.get("ExitCode") == 0
         )
-        if result.stdout.strip():
-            print(result.stdout.strip().split("\n")[-1])  # Last line
 
         return True
     if health_status == "starting":
@@ -66,45 +170,30 @@ def is_bot_healthy() -> bool:
 
     # Print the most recent health check log
     print_message("Last health check result:", Colors.YELLOW)
-    result = run_command(
-        [
-            "docker",
-            "inspect",
-            "--format",
-            "{{range .State.Health.Log}}{{.Output}}{{end}}",
-            container_id,
-        ],
-    )
-    if result.stdout.strip():
-        print(result.stdout.strip().split("\n")[-1])  # Last line
+    _print_last_health_output(health_log)
 
     return False
 
 
-def is_bot_operational() -> bool:
-    """Check if bot is operational"""
+def is_bot_operational(snapshot: Optional[HealthSnapshot] = None) -> bool:
+    """Check if bot is operational
+
+    Uses ``snapshot`` when given instead of probing the container again.
+    """
     debug_print("Starting is_bot_operational check")
 
-    # Get container ID
-    result = run_command(
-        ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "-q", "bot"],
-    )
-    container_id = result.stdout.strip()
+    if snapshot is None:
+        snapshot = capture_health_snapshot()
 
-    debug_print(f"Container ID for operational check: {container_id}")
+    debug_print(f"Container ID for operational check: {snapshot.container_id}")
 
-    if not container_id:
+    if not snapshot.container_running:
         debug_print("Container is not running for operational check")
         print_error("Container is not running")
         return False
 
     # Check if Python process is running
-    debug_print("Checking if Python bot process is running")
-    result = run_command(
-        ["docker", "exec", container_id, "pgrep", "-f", "python.*src[/.]bot"],
-    )
-
-    if result.returncode != 0:
+    if not snapshot.process_running:
         debug_print("Bot process is not running inside container")
         print_error("Bot process is not running inside container")
         return False
@@ -115,18 +204,11 @@ def is_bot_operational() -> bool:
     debug_print("Checking logs for operational status")
     print_message("Checking logs for operational status...", Colors.YELLOW)
 
-    result = run_command(["docker", "logs", "--tail", "50", container_id])
-    logs = result.stdout + result.stderr
+    logs = snapshot.logs
 
     # Check for conflict errors first
-    if any(
-        phrase in logs
-        for phrase in [
-            "telegram.error.Conflict",
-            'error_code":409',
-            "terminated by other getUpdates",
-        ]
-    ):
+    has_conflict = any(phrase in logs for phrase in _CONFLICT_PHRASES)
+    if has_conflict:
         print_error(
             "Telegram API conflict detected - another bot is running with the same token",
         )
@@ -136,12 +218,12 @@ def is_bot_operational() -> bool:
         )
 
     # Check for successful startup
-    if "Application started" in logs:
+    if b"Application started" in logs:
         print_message("Bot is operational", Colors.GREEN)
         return True
 
     # Check for API calls - if multiple successful API calls, consider operational
-    api_calls = logs.count('"HTTP/1.1 200 OK"')
+    api_calls = logs.count(_API_OK_MARKER)
     if api_calls >= 2:
         print_message(
             f"Bot is operational ({api_calls} successful API calls detected)",
@@ -150,17 +232,7 @@ def is_bot_operational() -> bool:
         return True
 
     # Even with conflicts, bot might be partly operational
-    if (
-        any(
-            phrase in logs
-            for phrase in [
-                "telegram.error.Conflict",
-                'error_code":409',
-                "terminated by other getUpdates",
-            ]
-        )
-        and '"HTTP/1.1 200 OK"' in logs
-    ):
+    if has_conflict and _API_OK_MARKER in logs:
         print_message("Bot is partly operational despite conflicts", Colors.YELLOW)
         return True
 
@@ -168,8 +240,13 @@ def is_bot_operational() -> bool:
     return False
 
 
+@ttl_cache(QUICK_HEALTH_CHECK_TTL)
 def quick_health_check() -> bool:
-    """Quick health check for Docker healthcheck mode"""
+    """Quick health check for Docker healthcheck mode
+
+    Results are reused for ``QUICK_HEALTH_CHECK_TTL`` seconds so diagnostics
+    that check back to back do not re-run the process lookup.
+    """
     debug_print("Running quick health check")
 
     try:
@@ -197,15 +274,20 @@ def quick_health_check() -> bool:
         return False
 
 
-def comprehensive_health_check() -> bool:
-    """Comprehensive health check for diagnostics mode"""
+def comprehensive_health_check(snapshot: Optional[HealthSnapshot] = None) -> bool:
+    """Comprehensive health check for diagnostics mode
+
+    Uses ``snapshot`` when given instead of probing the container again.
+    """
     debug_print("Running comprehensive health check")
 
     success = True
+    if snapshot is None:
+        snapshot = capture_health_snapshot()
 
     # Basic health check
     print_message("📋 Basic Health Check:", Colors.BLUE)
-    if quick_health_check():
+    if snapshot.process_running:
         print_message("✅ Process check passed", Colors.GREEN)
     else:
         print_message("❌ Process check failed", Colors.RED)
@@ -213,37 +295,17 @@ def comprehensive_health_check() -> bool:
 
     # Container health check
     print_message("\n🐳 Container Health Check:", Colors.BLUE)
-    try:
-        result = run_command(
-            ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "bot"],
-        )
-        if result.returncode == 0 and "Up" in result.stdout:
-            print_message("✅ Container is running", Colors.GREEN)
+    if snapshot.container_running:
+        print_message("✅ Container is running", Colors.GREEN)
 
-            # Check recent logs for errors
-            result = run_command(
-                [
-                    "docker-compose",
-                    "-f",
-                    "docker/docker-compose.yml",
-                    "logs",
-                    "--tail",
-                    "10",
-                    "bot",
-                ],
-            )
-
-            if any(level in result.stdout for level in ["ERROR", "CRITICAL"]):
-                print_message("⚠️  Recent errors found in logs", Colors.YELLOW)
-                success = False
-            else:
-                print_message("✅ No recent errors in logs", Colors.GREEN)
-        else:
-            print_message("❌ Container is not running", Colors.RED)
+        # Check recent logs for errors
+        if snapshot.recent_errors:
+            print_message("⚠️  Recent errors found in logs", Colors.YELLOW)
             success = False
-
-    except Exception as e:
-        print_message(f"❌ Container check error: {e}", Colors.RED)
+        else:
+            print_message("✅ No recent errors in logs", Colors.GREEN)
+    else:
+        print_message("❌ Container is not running", Colors.RED)
         success = False
 
     # File system checks
@@ -251,16 +313,18 @@ def comprehensive_health_check() -> bool:
     try:
         from pathlib import Path
 
-        data_dir = Path("/app/data") if Path("/app").exists() else Path("./data")
-        logs_dir = Path("/app/logs") if Path("/app").exists() else Path("./logs")
+        base_dir = Path("/app") if Path("/app").exists() else Path(".")
+        data_dir = base_dir / "data"
+        logs_dir = base_dir / "logs"
 
-        if data_dir.exists() and data_dir.is_dir():
+        # is_dir() is False for missing paths, so one stat per directory
+        if data_dir.is_dir():
             print_message("✅ Data directory exists", Colors.GREEN)
         else:
             print_message("❌ Data directory missing", Colors.RED)
             success = False
 
-        if logs_dir.exists() and logs_dir.is_dir():
+        if logs_dir.is_dir():
             print_message("✅ Logs directory exists", Colors.GREEN)
         else:
             print_message("❌ Logs directory missing", Colors.RED)
@@ -287,18 +351,10 @@ def check_bot_status() -> Dict[str, Any]:
 
     # Step 1: Verify container is still running
     print_message("Step 1: Verifying container is running...", Colors.YELLOW)
-    result = run_command(
-        ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "bot"],
-    )
-
-    if result.returncode != 0 or "Up" not in result.stdout:
+    if not is_service_running("bot"):
         status["errors"].append("Container is not running")
         print_error("Container is not running!")
-        subprocess.run(
-            ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "bot"],
-            check=False,
-            capture_output=False,
-        )
+        print_compose_ps("bot")
         return status
 
     print_message("✅ Container is running", Colors.GREEN)
@@ -313,47 +369,42 @@ def check_bot_status() -> Dict[str, Any]:
 
     time.sleep(5)
 
+    # Fetched once and shared by every step that shows logs
+    recent_logs = _fetch_bot_logs()
+
     # Step 3: Show recent logs
     print_message("Step 3: Recent container logs:", Colors.YELLOW)
-    subprocess.run(
-        [
-            "docker-compose",
-            "-f",
-            "docker/docker-compose.yml",
-            "logs",
-            "--tail",
-            "10",
-            "bot",
-        ],
-        check=False,
-        capture_output=False,
-    )
+    _print_log_tail(recent_logs, 10)
 
     # Step 4: Health check loop
-    print_message("Step 4: Health check loop (max 30 attempts)...", Colors.YELLOW)
-    max_attempts = 30
+    print_message(
+        f"Step 4: Health check loop (up to {_HEALTH_WAIT_BUDGET:.0f} seconds)...",
+        Colors.YELLOW,
+    )
+    deadline = time.monotonic() + _HEALTH_WAIT_BUDGET
+    delay = 0.25
+    attempt = 0
+    # Resolved once; each attempt then only inspects the container
+    container_id = get_service_container_id("bot")
 
-    for attempt in range(1, max_attempts + 1):
-        print_message(
-            f"Checking bot health (attempt {attempt}/{max_attempts})...",
-            Colors.YELLOW,
-        )
+    while True:
+        attempt += 1
+        print_message(f"Checking bot health (attempt {attempt})...", Colors.YELLOW)
 
         # Check if container is still running
-        result = run_command(
-            ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "bot"],
-        )
-        if "Up" not in result.stdout:
+        state = get_container_state(container_id) if container_id else None
+        if state is None or not state[0]:
             status["errors"].append("Container stopped during health check")
             print_error("Container stopped running during health check!")
             return status
 
         # Check if bot is healthy using Docker healthcheck
-        if is_bot_healthy():
+        if is_bot_healthy(container_id):
             print_message("Bot health check: PASSED", Colors.GREEN)
             status["bot_healthy"] = True
             break
-        if attempt == max_attempts:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
             print_message(
                 "Bot health check did not pass within timeout, but bot might still be functioning.",
                 Colors.YELLOW,
@@ -361,26 +412,13 @@ def check_bot_status() -> Dict[str, Any]:
             print_message("Continuing with operational check...", Colors.YELLOW)
             # Show recent logs for debugging
             print_message("Recent logs for debugging:", Colors.YELLOW)
-            subprocess.run(
-                [
-                    "docker-compose",
-                    "-f",
-                    "docker/docker-compose.yml",
-                    "logs",
-                    "--tail",
-                    "15",
-                    "bot",
-                ],
-                check=False,
-                capture_output=False,
-            )
-        else:
-            print_message(
-                "Bot health check not yet passing, waiting...",
-                Colors.YELLOW,
-            )
-            time.sleep(5)
-            continue
+            _print_log_tail(recent_logs, 15)
+            break
+        print_message("Bot health check not yet passing, waiting...", Colors.YELLOW)
+        # Exponential backoff from 250ms, capped at the old 5s interval and
+        # never sleeping past the deadline
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 5.0)
 
     # Step 5: Operational check
     print_message("Step 5: Operational check...", Colors.YELLOW)
@@ -392,25 +430,9 @@ def check_bot_status() -> Dict[str, Any]:
         # Show final status summary
         print_message("\n=== FINAL STATUS SUMMARY ===", Colors.GREEN)
         print_message("Container status:", Colors.GREEN)
-        subprocess.run(
-            ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "bot"],
-            check=False,
-            capture_output=False,
-        )
+        print_compose_ps("bot")
         print_message("Most recent logs:", Colors.GREEN)
-        subprocess.run(
-            [
-                "docker-compose",
-                "-f",
-                "docker/docker-compose.yml",
-                "logs",
-                "--tail",
-                "5",
-                "bot",
-            ],
-            check=False,
-            capture_output=False,
-        )
+        _print_log_tail(recent_logs, 5)
         print_message("=== END STATUS SUMMARY ===", Colors.GREEN)
 
     else:
@@ -424,25 +446,9 @@ def check_bot_status() -> Dict[str, Any]:
         # Detailed diagnostic info
         print_message("\n=== DIAGNOSTIC INFORMATION ===", Colors.YELLOW)
         print_message("Container status:", Colors.YELLOW)
-        subprocess.run(
-            ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "bot"],
-            check=False,
-            capture_output=False,
-        )
+        print_compose_ps("bot")
         print_message("Extended logs for diagnostics:", Colors.YELLOW)
-        subprocess.run(
-            [
-                "docker-compose",
-                "-f",
-                "docker/docker-compose.yml",
-                "logs",
-                "--tail",
-                "25",
-                "bot",
-            ],
-            check=False,
-            capture_output=False,
-        )
+        _print_log_tail(recent_logs, _STATUS_LOG_TAIL)
         print_message("=== END DIAGNOSTICS ===", Colors.YELLOW)
 
         print_message(
@@ -20,9 +20,22 @@ class Colors:
     NC = "\033[0m"  # No Color
 
 
+_HEADER_RULE = "=" * 50
+
+# Colors are only emitted to a terminal, and never when NO_COLOR is set
+_USE_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+
 def print_message(message: str, color: str = Colors.NC):
-    """Print a formatted message with optional color"""
-    print(f"{color}{message}{Colors.NC}")
+    """Print a formatted message with optional color
+
+    Writes the whole line with a single ``sys.stdout.write``; buffering is
+    the same as for ``print``.
+    """
+    if _USE_COLOR:
+        sys.stdout.write(f"{color}{message}{Colors.NC}\n")
+    else:
+        sys.stdout.write(f"{message}\n")
 
 
 def print_warning(message: str):
@@ -37,14 +50,17 @@ def print_error(message: str):
 
 def print_section(title: str):
     """Print a section header"""
-    print(f"\n{Colors.BLUE}=== {title} ==={Colors.NC}")
+    print()
+    print_message(f"=== {title} ===", Colors.BLUE)
 
 
 def print_header(title: str):
     """Print a main header (like section but more prominent)"""
-    print(f"\n{Colors.GREEN}{'=' * 50}{Colors.NC}")
-    print(f"{Colors.GREEN}{title}{Colors.NC}")
-    print(f"{Colors.GREEN}{'=' * 50}{Colors.NC}\n")
+    print()
+    print_message(_HEADER_RULE, Colors.GREEN)
+    print_message(title, Colors.GREEN)
+    print_message(_HEADER_RULE, Colors.GREEN)
+    print()
 
 
 def print_success(message: str):
@@ -52,7 +68,22 @@ def print_success(message: str):
     print_message(message, Colors.GREEN)
 
 
+def _debug_enabled() -> bool:
+    """Check whether DEBUG or VERBOSE mode is set in the environment"""
+    return os.getenv("DEBUG", "0") == "1" or os.getenv("VERBOSE", "0") == "1"
+
+
+# Resolved once; call refresh_debug_mode() after changing DEBUG/VERBOSE
+_DEBUG = _debug_enabled()
+
+
+def refresh_debug_mode():
+    """Re-read DEBUG/VERBOSE from the environment"""
+    global _DEBUG
+    _DEBUG = _debug_enabled()
+
+
 def debug_print(message: str):
     """Print debug message if debug mode is enabled"""
-    if os.getenv("DEBUG", "0") == "1" or os.getenv("VERBOSE", "0") == "1":
+    if _DEBUG:
         print(f"DEBUG: {message}", file=sys.stderr)
@@ -5,12 +5,25 @@ This module provides functions for managing bot services,
 including starting, stopping, and checking service status.
 """
 
+import json
 import os
+import select
 import subprocess
 import time
-from typing import Any, Dict
-
-from .docker_utils import get_container_status, run_command
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .docker_utils import (
+    compose_command,
+    compose_supports_wait,
+    get_container_state,
+    get_container_status,
+    get_service_container_id,
+    invalidate_container_status,
+    is_docker_daemon_running,
+    is_service_running,
+    run_command,
+)
 from .environment import is_dry_run
 from .errors import ErrorContext, ServiceError
 from .output import (
@@ -21,6 +34,9 @@ from .output import (
     print_warning,
 )
 
+# Seconds to wait for a started service to become healthy
+SERVICE_READY_TIMEOUT = 60
+
 
 def get_service_status() -> Dict[str, Any]:
     """Get comprehensive service status"""
@@ -33,32 +49,27 @@ def get_service_status() -> Dict[str, Any]:
         "healthy": False,
     }
 
-    # Check Docker daemon
-    result = run_command(["docker", "info"])
-    status["docker_running"] = result.returncode == 0
+    # The daemon, container and compose probes are independent, so overlap
+    # their Docker round trips
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        daemon_future = executor.submit(is_docker_daemon_running)
+        container_future = executor.submit(get_container_status)
+        services_future = executor.submit(_get_compose_services)
 
-    if not status["docker_running"]:
-        return status
+        # Check Docker daemon
+        status["docker_running"] = daemon_future.result()
+        if not status["docker_running"]:
+            return status
 
-    # Check containers
-    container_status = get_container_status()
-    status["containers"] = container_status
+        # Check containers
+        container_status = container_future.result()
+        status["containers"] = container_status
 
-    # Check docker-compose services
-    result = run_command(
-        ["docker-compose", "-f", "docker/docker-compose.yml", "ps", "--services"],
-    )
-    if result.returncode == 0:
-        services = [s.strip() for s in result.stdout.split("\n") if s.strip()]
-        for service in services:
-            service_result = run_command(
-                ["docker-compose", "-f", "docker/docker-compose.yml", "ps", service],
-            )
-            is_running = "Up" in service_result.stdout
-            status["services"][service] = {
-                "running": is_running,
-                "status": "healthy" if is_running else "stopped",
-            }
+        # Check docker-compose services
+        services = services_future.result()
+    if services is None:
+        services = _get_compose_services_legacy()
+    status["services"] = services
 
     # Overall health
     status["healthy"] = (
@@ -70,6 +81,75 @@ def get_service_status() -> Dict[str, Any]:
     return status
 
 
+def _parse_compose_ps_json(output: str) -> List[Dict[str, Any]]:
+    """Parse ``docker-compose ps --format json`` output
+
+    Compose releases before 2.21 print a single JSON array, newer ones
+    print one JSON object per line.
+    """
+    output = output.strip()
+    if not output:
+        return []
+    if output.startswith("["):
+        return json.loads(output)
+    return [json.loads(line) for line in output.splitlines() if line.strip()]
+
+
+def _get_compose_services() -> Optional[Dict[str, Dict[str, Any]]]:
+    """Get the state of all compose services with a single JSON query
+
+    Returns None when the installed docker-compose cannot produce JSON.
+    """
+    result = run_command(
+        compose_command("ps", "--all", "--format", "json"),
+    )
+    if result.returncode != 0:
+        debug_print("docker-compose ps --format json is not supported")
+        return None
+
+    try:
+        rows = _parse_compose_ps_json(result.stdout)
+    except ValueError as e:
+        debug_print(f"Failed to parse docker-compose ps output: {e}")
+        return None
+
+    services = {}
+    for row in rows:
+        is_running = row.get("State") == "running"
+        services[row["Service"]] = {
+            "running": is_running,
+            "status": (row.get("Health") or "healthy") if is_running else "stopped",
+        }
+    return services
+
+
+def _get_compose_services_legacy() -> Dict[str, Dict[str, Any]]:
+    """Get the state of compose services with one query per service
+
+    Fallback for docker-compose releases without ``ps --format json``.
+    """
+    services = {}
+    result = run_command(compose_command("ps", "--services"))
+    if result.returncode == 0:
+        names = [s.strip() for s in result.stdout.split("\n") if s.strip()]
+        if not names:
+            return services
+        with ThreadPoolExecutor(max_workers=min(8, len(names))) as executor:
+            results = executor.map(
+                lambda service: run_command(
+                    compose_command("ps", service),
+                ),
+                names,
+            )
+            for service, service_result in zip(names, results):
+                is_running = "Up" in service_result.stdout
+                services[service] = {
+                    "running": is_running,
+                    "status": "healthy" if is_running else "stopped",
+                }
+    return services
+
+
 def start_service(service: str = "bot") -> bool:
     """Start a specific service"""
     debug_print(f"Starting service: {service}")
@@ -84,20 +164,30 @@ def start_service(service: str = "bot") -> bool:
 
         print_message(f"🚀 Starting service: {service}", Colors.BLUE)
 
-        # Start the service
-        cmd = ["docker-compose", "-f", "docker/docker-compose.yml", "up", "-d"]
+        # Start the service. Newer compose releases can wait for the
+        # healthchecks themselves, which replaces our polling loop.
+        use_wait = compose_supports_wait()
+        cmd = compose_command("up", "-d")
+        if use_wait:
+            cmd.extend(["--wait", "--wait-timeout", str(SERVICE_READY_TIMEOUT)])
+            print_message(f"Waiting for {service} to be ready...", Colors.YELLOW)
         if service != "all":
             cmd.append(service)
 
         result = subprocess.run(cmd, check=False, env=env, capture_output=False)
+        invalidate_container_status()
         if result.returncode != 0:
+            if use_wait and is_service_running(service):
+                print_warning(f"Service {service} may not be fully ready")
+                return False
             raise ServiceError(f"Failed to start service {service}")
 
         # Wait for service to be ready
-        print_message(f"Waiting for {service} to be ready...", Colors.YELLOW)
-        if not wait_for_service_ready(service):
-            print_warning(f"Service {service} may not be fully ready")
-            return False
+        if not use_wait:
+            print_message(f"Waiting for {service} to be ready...", Colors.YELLOW)
+            if not wait_for_service_ready(service):
+                print_warning(f"Service {service} may not be fully ready")
+                return False
 
         print_success(f"✅ Service {service} started successfully")
         return True
@@ -115,13 +205,14 @@ def stop_service(service: str = "bot", cleanup: bool = False) -> bool:
         print_message(f"🛑 Stopping service: {service}", Colors.BLUE)
 
         if service == "all":
-            cmd = ["docker-compose", "-f", "docker/docker-compose.yml", "down"]
+            cmd = compose_command("down")
             if cleanup:
                 cmd.extend(["-v", "--remove-orphans"])
         else:
-            cmd = ["docker-compose", "-f", "docker/docker-compose.yml", "stop", service]
+            cmd = compose_command("stop", service)
 
         result = subprocess.run(cmd, check=False, capture_output=False)
+        invalidate_container_status()
         if result.returncode != 0:
             raise ServiceError(f"Failed to stop service {service}")
 
@@ -139,69 +230,182 @@ def restart_service(service: str = "bot") -> bool:
     if not stop_service(service):
         return False
 
-    # Wait a moment
-    time.sleep(2)
+    # Wait until the old container is actually down
+    if not wait_for_service_stopped(service):
+        print_warning(f"Service {service} is still running after stop")
 
     # Start again
     return start_service(service)
 
 
-def wait_for_service_ready(service: str, timeout: int = 60) -> bool:
+def wait_for_service_stopped(service: str = "bot", timeout: float = 10) -> bool:
+    """Wait until no container of the service is running
+
+    Polls with exponential backoff starting at 50ms, capped at 500ms.
+    """
+    debug_print(f"Waiting for service {service} to stop (timeout: {timeout}s)")
+
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        if not is_service_running(service):
+            debug_print(f"Service {service} is stopped")
+            return True
+        if time.monotonic() + delay > deadline:
+            break
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+    debug_print(f"Timeout waiting for service {service} to stop")
+    return False
+
+
+def _sleep_backoff(delay: float, deadline: float) -> float:
+    """Sleep for the current backoff step and return the next one"""
+    time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+    return min(delay * 2, 5.0)
+
+
+def _poll_until_healthy(container_id: str, deadline: float) -> bool:
+    """Poll the container health status with exponential backoff
+
+    Gives up early once the container stops or turns unhealthy.
+    """
+    delay = 0.5
+    while True:
+        state = get_container_state(container_id)
+        if state is None or not state[0]:
+            debug_print(f"Container {container_id} is no longer running")
+            return False
+        health_status = state[1]
+        debug_print(f"Container health status: {health_status}")
+        if health_status == "healthy":
+            return True
+        if health_status == "unhealthy" or time.monotonic() >= deadline:
+            return False
+        delay = _sleep_backoff(delay, deadline)
+
+
+def _wait_for_healthy(container_id: str, deadline: float) -> bool:
+    """Block on Docker health events until the container reports healthy
+
+    Returns False as soon as the container dies or turns unhealthy. Falls
+    back to polling when the event stream cannot be used.
+    """
+    cmd = [
+        "docker",
+        "events",
+        "--filter",
+        f"container={container_id}",
+        "--filter",
+        "event=health_status",
+        "--filter",
+        "event=die",
+        "--format",
+        "{{.Status}}",
+    ]
+    debug_print(f"Running command: {' '.join(cmd)}")
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+    except OSError as e:
+        debug_print(f"Failed to watch Docker events: {e}")
+        return _poll_until_healthy(container_id, deadline)
+
+    try:
+        # The event stream is already open, so a transition that happens
+        # between this inspect and the first read is not lost
+        state = get_container_state(container_id)
+        if state is None or not state[0]:
+            debug_print(f"Container {container_id} is no longer running")
+            return False
+        debug_print(f"Container health status: {state[1]}")
+        if state[1] == "healthy":
+            return True
+        if state[1] == "unhealthy":
+            return False
+
+        fd = proc.stdout.fileno()
+        pending = b""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                return False
+
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                debug_print("Docker events stream closed, falling back to polling")
+                break
+
+            *events, pending = (pending + chunk).split(b"\n")
+            for event in events:
+                status = event.decode(errors="replace").strip()
+                debug_print(f"Health event: {status}")
+                if status == "health_status: healthy":
+                    return True
+                if status in ("die", "health_status: unhealthy"):
+                    return False
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    return _poll_until_healthy(container_id, deadline)
+
+
+def wait_for_service_ready(service: str, timeout: int = SERVICE_READY_TIMEOUT) -> bool:
     """Wait for service to be ready"""
     debug_print(f"Waiting for service {service} to be ready (timeout: {timeout}s)")
 
-    start_time = time.time()
+    deadline = time.monotonic() + timeout
+
+    # "all" has no single container; wait for the project to run instead
+    if service == "all":
+        delay = 0.5
+        while time.monotonic() < deadline:
+            if is_service_running("all"):
+                debug_print("Services are running")
+                return True
+            delay = _sleep_backoff(delay, deadline)
+        debug_print("Timeout waiting for services to be ready")
+        return False
 
-    while time.time() - start_time < timeout:
-        # Check if container is running
-        status = get_container_status()
-        if not status.get("running", False):
-            debug_print(f"Service {service} container is not running")
-            time.sleep(2)
-            continue
-
-        # For bot service, check health
-        if service == "bot":
-            result = run_command(
-                [
-                    "docker-compose",
-                    "-f",
-                    "docker/docker-compose.yml",
-                    "ps",
-                    "-q",
-                    "bot",
-                ],
-            )
-            container_id = result.stdout.strip()
-
-            if container_id:
-                # Check health status
-                result = run_command(
-                    [
-                        "docker",
-                        "inspect",
-                        "--format",
-                        "{{.State.Health.Status}}",
-                        container_id,
-                    ],
-                )
-                health_status = result.stdout.strip()
-
-                if health_status == "healthy":
-                    debug_print(f"Service {service} is healthy")
+    # Wait for the container to come up. The container ID is resolved once
+    # and then only inspected; it is re-resolved if the container goes away.
+    container_id = ""
+    running = False
+    delay = 0.5
+    while time.monotonic() < deadline:
+        if not container_id:
+            container_id = get_service_container_id(service)
+
+        if container_id:
+            state = get_container_state(container_id)
+            if state is None:
+                debug_print(f"Container {container_id} disappeared, re-resolving")
+                container_id = ""
+            elif state[0]:
+                # Other services only need to be running
+                if service != "bot" or state[1] == "healthy":
+                    debug_print(f"Service {service} is ready")
                     return True
-                if health_status == "starting":
-                    debug_print(f"Service {service} is starting...")
-                    time.sleep(5)
-                    continue
-                debug_print(
-                    f"Service {service} health check failed: {health_status}",
-                )
-                time.sleep(2)
-                continue
+                running = True
+                break
         else:
-            # For other services, just check if running
-            return True
+            debug_print(f"Service {service} container is not running")
+        delay = _sleep_backoff(delay, deadline)
+
+    # For bot service, wait for the healthcheck to pass
+    if running and _wait_for_healthy(container_id, deadline):
+        debug_print(f"Service {service} is healthy")
+        return True
 
     debug_print(f"Timeout waiting for service {service} to be ready")
     return False
@@ -6,8 +6,8 @@ file management, and system checks.
 """
 
 import os
-import platform
 import stat
+from functools import cache
 from pathlib import Path
 from typing import Dict
 
@@ -20,16 +20,47 @@ from .output import (
     print_success,
 )
 
+# Permission bits added to project scripts by setup_permissions
+_EXEC_MASK = stat.S_IXUSR | stat.S_IXGRP
 
-def get_system_info() -> Dict[str, str]:
-    """Get system information"""
-    debug_print("Getting system information")
+# Files in scripts/ that setup_permissions makes executable
+_SCRIPT_SUFFIXES = (".py", ".sh")
 
-    info = {
+# Default content for data files created by setup_permissions
+_DEFAULT_DATA_CONTENT: Dict[str, bytes] = {"quotes.json": b"[]"}
+
+
+@cache
+def _get_platform_info() -> Dict[str, str]:
+    """Get platform details, which cannot change during the process"""
+    # Imported lazily; only status reporting needs it
+    import platform
+
+    return {
         "platform": platform.system(),
         "release": platform.release(),
         "machine": platform.machine(),
         "python_version": platform.python_version(),
+    }
+
+
+def _chmod_if_needed(path: str, mode: int) -> bool:
+    """Set permission bits only if they differ; returns False if path is missing"""
+    try:
+        current_mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return False
+    if current_mode != mode:
+        os.chmod(path, mode)
+    return True
+
+
+def get_system_info() -> Dict[str, str]:
+    """Get system information"""
+    debug_print("Getting system information")
+
+    info = {
+        **_get_platform_info(),
         "user": os.getenv("USER", "unknown"),
         "home": os.getenv("HOME", "unknown"),
         "pwd": os.getcwd(),
@@ -53,7 +84,7 @@ def setup_permissions() -> bool:
             for dir_name, permissions in directories:
                 dir_path = Path(dir_name)
                 dir_path.mkdir(exist_ok=True)
-                os.chmod(dir_path, permissions)
+                _chmod_if_needed(dir_name, permissions)
                 debug_print(f"Set permissions {oct(permissions)} for {dir_name}/")
 
             # Set permissions for important files
@@ -64,43 +95,46 @@ def setup_permissions() -> bool:
             ]
 
             for file_name, permissions in files:
-                file_path = Path(file_name)
-                if file_path.exists():
-                    os.chmod(file_path, permissions)
-                    debug_print(f"Set permissions {oct(permissions)} for {file_name}")
-
-            # Make scripts executable
-            script_patterns = ["scripts/*.py", "scripts/*.sh"]
-
-            for pattern in script_patterns:
-                import glob
-
-                for script_file in glob.glob(pattern):
-                    script_path = Path(script_file)
-                    if script_path.exists():
-                        # Add execute permission
-                        current_mode = script_path.stat().st_mode
-                        new_mode = current_mode | stat.S_IXUSR | stat.S_IXGRP
-                        os.chmod(script_path, new_mode)
-                        debug_print(f"Made {script_file} executable")
-
-            # Create data files if they don't exist
+                if not _chmod_if_needed(file_name, permissions):
+                    continue
+                debug_print(f"Set permissions {oct(permissions)} for {file_name}")
+
+            # Make scripts executable in a single directory pass
+            try:
+                with os.scandir("scripts") as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(_SCRIPT_SUFFIXES):
+                            continue
+                        if not entry.is_file():
+                            continue
+                        # Add execute permission unless already set
+                        current_mode = entry.stat().st_mode
+                        if current_mode & _EXEC_MASK == _EXEC_MASK:
+                            continue
+                        os.chmod(entry.path, current_mode | _EXEC_MASK)
+                        debug_print(f"Made {entry.path} executable")
+            except FileNotFoundError:
+                debug_print("No scripts directory found")
+
+            # Create data files if they don't exist; their data/ parent was
+            # created with the directories above
             data_files = ["data/quotes.json"]
 
             for data_file in data_files:
                 file_path = Path(data_file)
-                if not file_path.exists():
-                    file_path.parent.mkdir(exist_ok=True)
 
+                # Create atomically; an existing file is left untouched
+                try:
+                    fd = os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+                except FileExistsError:
+                    continue
+                try:
                     # Create with default content based on file type
-                    if data_file.endswith("quotes.json"):
-                        content = "[]"
-                    else:
-                        content = "{}"
-
-                    file_path.write_text(content)
-                    os.chmod(file_path, 0o644)
-                    debug_print(f"Created {data_file}")
+                    os.write(fd, _DEFAULT_DATA_CONTENT.get(file_path.name, b"{}"))
+                    os.fchmod(fd, 0o644)
+                finally:
+                    os.close(fd)
+                debug_print(f"Created {data_file}")
 
             print_success("✅ Permissions setup completed")
             return True
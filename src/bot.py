@@ -19,6 +19,7 @@ from telegram import (
     InlineKeyboardMarkup,
     Update,
 )
+from telegram.error import RetryAfter
 from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes
 
 from src.config import (
@@ -26,9 +27,12 @@ from src.config import (
     BOT_NAME,
     BOT_TIMEZONE,
     LOGGING_CONFIG,
+    NOTIFICATION_CONCURRENCY,
     NOTIFICATION_DAY,
     NOTIFICATION_HOUR,
+    NOTIFICATION_MAX_ATTEMPTS,
     NOTIFICATION_MINUTE,
+    NOTIFICATION_RATE,
     USER_COMMANDS,
     WELCOME_MESSAGE,
 )
@@ -41,6 +45,23 @@ if not logging.getLogger().handlers:
     logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 
+# Command sets for membership tests; the lists keep the display order
+_USER_COMMAND_SET = frozenset(USER_COMMANDS)
+_ENABLED_COMMANDS = _USER_COMMAND_SET | frozenset(ADMIN_COMMANDS)
+
+# Command menus and the admin capability list only depend on configuration
+_USER_BOT_COMMANDS = [
+    BotCommand(command.lstrip("/"), f"User command: {command.lstrip('/')}")
+    for command in USER_COMMANDS
+]
+_ADMIN_BOT_COMMANDS = [
+    BotCommand(command.lstrip("/"), f"Admin command: {command.lstrip('/')}")
+    for command in ADMIN_COMMANDS
+]
+_ADMIN_CAPABILITIES = "\n".join(
+    f"• {cmd} - Admin command" for cmd in ADMIN_COMMANDS if cmd not in _USER_COMMAND_SET
+)
+
 
 class QuitSmokingBot:
     def __init__(self):
@@ -50,7 +71,17 @@ class QuitSmokingBot:
         self.scheduler = None
         self.application = None
         self._running = False
-        self._shutdown_event = asyncio.Event()
+        # Created in run(), on the loop that waits on it
+        self._shutdown_event = None
+        self._loop = None
+        self._stop_requested = False
+        # Outgoing notifications: (bot, chat_id, text, attempt), drained by
+        # _tx_worker; both are created on first use on the running loop
+        self._tx_queue = None
+        self._tx_worker = None
+        self._tx_tasks = set()
+        # Loop time before which no new sends start (Telegram RetryAfter)
+        self._tx_resume_at = 0.0
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Send a message when the command /start is issued."""
@@ -90,15 +121,99 @@ class QuitSmokingBot:
             logger.warning("No users to send notifications to")
             return
 
+        # The queue worker paces the sends; wait until all of them are done
+        self._ensure_tx_worker()
         for user_id in users:
-            try:
-                await bot.send_message(chat_id=user_id, text=status_info)
-                logger.info(f"Status sent to user {user_id}")
-            except Exception as e:
-                logger.error(f"Failed to send notification to user {user_id}: {e}")
+            self._tx_queue.put_nowait((bot, user_id, status_info, 1))
+        await self._wait_for_tx_queue()
 
         logger.info("Notification sending completed")
 
+    def _ensure_tx_worker(self):
+        """Start the notification queue worker unless it is running
+
+        A worker that stopped is replaced together with its queue, so
+        messages it left behind are not sent later.
+        """
+        if self._tx_worker and not self._tx_worker.done():
+            return
+        if self._tx_queue and not self._tx_queue.empty():
+            logger.warning(
+                f"Dropping {self._tx_queue.qsize()} queued notifications "
+                f"of a stopped worker",
+            )
+        self._tx_queue = asyncio.Queue()
+        self._tx_worker = asyncio.create_task(self._drain_tx_queue())
+
+    async def _wait_for_tx_queue(self):
+        """Wait until the queue is drained, failing if the worker stops"""
+        join_task = asyncio.ensure_future(self._tx_queue.join())
+        await asyncio.wait(
+            {join_task, self._tx_worker},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if join_task.done():
+            return
+
+        join_task.cancel()
+        if self._tx_worker.cancelled():
+            raise RuntimeError("Notification worker was cancelled")
+        raise RuntimeError(
+            "Notification worker stopped",
+        ) from self._tx_worker.exception()
+
+    async def _drain_tx_queue(self):
+        """Send queued notifications, at most NOTIFICATION_RATE per second
+
+        Up to NOTIFICATION_CONCURRENCY sends are in flight at once.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
+        interval = 1 / NOTIFICATION_RATE
+        next_send_at = 0.0
+
+        while True:
+            item = await self._tx_queue.get()
+
+            # Keep to the rate, or wait out a Telegram back-off
+            pause = max(next_send_at, self._tx_resume_at) - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            await semaphore.acquire()
+
+            task = asyncio.create_task(self._send_queued(item, semaphore))
+            self._tx_tasks.add(task)
+            task.add_done_callback(self._tx_tasks.discard)
+            next_send_at = loop.time() + interval
+
+    async def _send_queued(self, item, semaphore):
+        """Send one queued notification, requeueing it when rate limited."""
+        bot, user_id, text, attempt = item
+        try:
+            await bot.send_message(chat_id=user_id, text=text)
+            logger.info(f"Status sent to user {user_id}")
+        except RetryAfter as e:
+            delay = e.retry_after
+            if isinstance(delay, datetime.timedelta):
+                delay = delay.total_seconds()
+            resume_at = asyncio.get_running_loop().time() + delay
+            self._tx_resume_at = max(self._tx_resume_at, resume_at)
+            if attempt >= NOTIFICATION_MAX_ATTEMPTS:
+                logger.error(
+                    f"Giving up on notification to user {user_id} "
+                    f"after {attempt} rate-limited attempts",
+                )
+            else:
+                logger.warning(
+                    f"Rate limited by Telegram, retrying user {user_id} in {delay}s",
+                )
+                self._tx_queue.put_nowait((bot, user_id, text, attempt + 1))
+        except Exception as e:
+            logger.error(f"Failed to send notification to user {user_id}: {e}")
+        finally:
+            semaphore.release()
+            self._tx_queue.task_done()
+
     async def send_monthly_notification(self, context=None) -> None:
         """Send monthly notifications to all users."""
         logger.info("Starting monthly notification process")
@@ -163,9 +278,9 @@ class QuitSmokingBot:
                 await update.message.reply_text("No registered users yet.")
                 return
 
-            users_text = "List of users:\n"
-            for i, uid in enumerate(users, 1):
-                users_text += f"{i}. {uid}\n"
+            users_text = "List of users:\n" + "".join(
+                f"{i}. {uid}\n" for i, uid in enumerate(users, 1)
+            )
 
             await update.message.reply_text(users_text)
         else:
@@ -187,9 +302,9 @@ class QuitSmokingBot:
                 await update.message.reply_text("The admin list is empty.")
                 return
 
-            admins_text = "List of administrators:\n"
-            for i, uid in enumerate(admins, 1):
-                admins_text += f"{i}. {uid}\n"
+            admins_text = "List of administrators:\n" + "".join(
+                f"{i}. {uid}\n" for i, uid in enumerate(admins, 1)
+            )
 
             await update.message.reply_text(admins_text)
         else:
@@ -224,7 +339,7 @@ class QuitSmokingBot:
             new_admin_id = int(context.args[0])
 
             # Check if user exists in our database
-            if new_admin_id not in self.user_manager.get_all_users():
+            if not self.user_manager.is_user(new_admin_id):
                 await update.message.reply_text(
                     f"User ID {new_admin_id} is not registered with the bot. "
                     f"The user must use /start command first.",
@@ -257,20 +372,11 @@ class QuitSmokingBot:
                     ],
                 )
 
-                # Create admin privileges message with detailed information
-                admin_capabilities = "\n".join(
-                    [
-                        f"• {cmd} - Admin command"
-                        for cmd in ADMIN_COMMANDS
-                        if cmd not in USER_COMMANDS
-                    ],
-                )
-
                 # Prepare notification message
                 admin_message = (
                     f"🔔 You have been given administrator privileges by {admin_name} (ID: {user_id}).\n\n"
                     f"As an admin, you can now use these additional commands:\n"
-                    f"{admin_capabilities}\n\n"
+                    f"{_ADMIN_CAPABILITIES}\n\n"
                     f"If you don't want to be an admin, you can decline these privileges using the button below "
                     f"or by using the /decline_admin command."
                 )
@@ -417,8 +523,8 @@ class QuitSmokingBot:
 
         if query.data == "decline_admin":
             # Get all admins and check if this is the last admin
-            admins = self.user_manager.get_all_admins()
-            if len(admins) <= 1 and user_id in admins:
+            is_admin = self.user_manager.is_admin(user_id)
+            if is_admin and len(self.user_manager.get_all_admins()) <= 1:
                 await query.message.reply_text(
                     "You are the last administrator and cannot decline your privileges. "
                     "Make someone else an admin first.",
@@ -426,7 +532,7 @@ class QuitSmokingBot:
                 return
 
             # Check if the user is an admin
-            if not self.user_manager.is_admin(user_id):
+            if not is_admin:
                 await query.message.reply_text("You are not an admin.")
                 return
 
@@ -451,31 +557,15 @@ class QuitSmokingBot:
         try:
             if is_admin:
                 # Set admin commands for the user
-                admin_commands = [
-                    BotCommand(
-                        command.lstrip("/"),
-                        f"Admin command: {command.lstrip('/')}",
-                    )
-                    for command in ADMIN_COMMANDS
-                ]
-
                 await self.application.bot.set_my_commands(
-                    admin_commands,
+                    _ADMIN_BOT_COMMANDS,
                     scope=BotCommandScopeChat(chat_id=user_id),
                 )
                 logger.info(f"Updated commands for admin {user_id}")
             else:
                 # Set normal user commands
-                user_commands = [
-                    BotCommand(
-                        command.lstrip("/"),
-                        f"User command: {command.lstrip('/')}",
-                    )
-                    for command in USER_COMMANDS
-                ]
-
                 await self.application.bot.set_my_commands(
-                    user_commands,
+                    _USER_BOT_COMMANDS,
                     scope=BotCommandScopeChat(chat_id=user_id),
                 )
                 logger.info(f"Updated commands for user {user_id}")
@@ -503,6 +593,14 @@ class QuitSmokingBot:
         logger.info("Shutting down bot...")
 
         try:
+            # Stop the notification worker and drop in-flight sends
+            pending = list(self._tx_tasks)
+            if self._tx_worker:
+                pending.append(self._tx_worker)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
             if self.scheduler and self.scheduler.running:
                 logger.info("Stopping scheduler...")
                 self.scheduler.shutdown(wait=True)
@@ -513,10 +611,20 @@ class QuitSmokingBot:
                 await self.application.shutdown()
 
             logger.info("Shutdown complete")
-            self._shutdown_event.set()
+            if self._shutdown_event:
+                self._shutdown_event.set()
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
 
+    def request_stop(self):
+        """Wake run() so that it shuts the bot down
+
+        Safe to call from signal handlers and other threads.
+        """
+        self._stop_requested = True
+        if self._loop and self._shutdown_event:
+            self._loop.call_soon_threadsafe(self._shutdown_event.set)
+
     async def setup(self):
         """Setup the bot and scheduler"""
         # Get token from command line arguments or environment variable
@@ -558,7 +666,7 @@ class QuitSmokingBot:
 
             # Register command handlers based on configuration
             for command, handler in command_handlers.items():
-                if command in USER_COMMANDS or command in ADMIN_COMMANDS:
+                if command in _ENABLED_COMMANDS:
                     self.application.add_handler(
                         CommandHandler(command.lstrip("/"), handler),
                     )
@@ -589,35 +697,31 @@ class QuitSmokingBot:
     async def set_bot_commands(self):
         """Set bot commands in Telegram to make them visible in the UI"""
         try:
-            # Define user commands with descriptions
-            user_commands = [
-                BotCommand(command.lstrip("/"), f"User command: {command.lstrip('/')}")
-                for command in USER_COMMANDS
-            ]
-
             # Set commands visible to all users
-            await self.application.bot.set_my_commands(user_commands)
+            await self.application.bot.set_my_commands(_USER_BOT_COMMANDS)
             logger.info("Set user commands in Telegram")
 
             # Get all admins
             admins = self.user_manager.get_all_admins()
 
-            # Define admin commands with descriptions
-            admin_commands = [
-                BotCommand(command.lstrip("/"), f"Admin command: {command.lstrip('/')}")
-                for command in ADMIN_COMMANDS
-            ]
-
-            # Set admin-specific commands for each admin
-            for admin_id in admins:
-                try:
-                    await self.application.bot.set_my_commands(
-                        admin_commands,
+            # Set admin-specific commands for all admins concurrently
+            results = await asyncio.gather(
+                *(
+                    self.application.bot.set_my_commands(
+                        _ADMIN_BOT_COMMANDS,
                         scope=BotCommandScopeChat(chat_id=admin_id),
                     )
+                    for admin_id in admins
+                ),
+                return_exceptions=True,
+            )
+            for admin_id, result in zip(admins, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Failed to set admin commands for {admin_id}: {result}"
+                    )
+                else:
                     logger.info(f"Set admin commands for admin {admin_id}")
-                except Exception as e:
-                    logger.error(f"Failed to set admin commands for {admin_id}: {e}")
 
             logger.info("Bot commands updated in Telegram")
         except Exception as e:
@@ -629,6 +733,12 @@ class QuitSmokingBot:
             return
 
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._shutdown_event = asyncio.Event()
+        if self._stop_requested:
+            # Stop was requested while setup() was still running
+            self._shutdown_event.set()
+        self._ensure_tx_worker()
 
         try:
             # Start the scheduler
@@ -658,8 +768,7 @@ class QuitSmokingBot:
             await self.application.updater.start_polling()
 
             # Keep the bot running until shutdown is requested
-            while self._running:
-                await asyncio.sleep(1)
+            await self._shutdown_event.wait()
 
         except Exception as e:
             logger.error(f"Error running bot: {e}")
@@ -672,19 +781,10 @@ def main():
     """Main function to run the bot"""
     bot = QuitSmokingBot()
 
-    async def async_shutdown(signum):
-        logger.info(f"Received signal {signum}")
-        bot._running = False
-        await bot.shutdown()
-
     def signal_handler(signum, frame):
-        # Create a new event loop for the signal handler
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(async_shutdown(signum))
-        finally:
-            loop.close()
+        logger.info(f"Received signal {signum}")
+        # run() performs the shutdown on the bot's own event loop
+        bot.request_stop()
 
     # Setup signal handlers
     signal.signal(signal.SIGTERM, signal_handler)
@@ -692,19 +792,27 @@ def main():
 
     # Run the bot
     try:
-        # Create a new event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(bot.run())
-    except KeyboardInterrupt:
-        logger.info("Received keyboard interrupt")
-        # Create a new event loop for keyboard interrupt handling
-        loop = asyncio.new_event_loop()
+        # Create a new event loop, libuv-based when uvloop is installed
+        try:
+            import uvloop
+
+            loop = uvloop.new_event_loop()
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        # Python 3.12+: tasks that finish without suspending (most handlers)
+        # complete immediately instead of waiting for a loop iteration
+        if hasattr(asyncio, "eager_task_factory"):
+            loop.set_task_factory(asyncio.eager_task_factory)
+        run_task = loop.create_task(bot.run())
         try:
-            loop.run_until_complete(async_shutdown("SIGINT"))
-        finally:
-            loop.close()
+            loop.run_until_complete(run_task)
+        except KeyboardInterrupt:
+            logger.info("Received keyboard interrupt")
+            # Let run() finish and perform the shutdown itself
+            bot.request_stop()
+            loop.run_until_complete(run_task)
     except Exception as e:
         logger.error(f"Error in main: {e}")
     finally:
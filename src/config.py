@@ -18,6 +18,9 @@ START_MONTH = 1
 NOTIFICATION_DAY = 23  # day of month
 NOTIFICATION_HOUR = 21  # hour (24-hour format)
 NOTIFICATION_MINUTE = 58  # minute
+NOTIFICATION_RATE = 25  # messages per second, below Telegram's 30 msg/s limit
+NOTIFICATION_CONCURRENCY = 25  # notification sends in flight at once
+NOTIFICATION_MAX_ATTEMPTS = 3  # sends per user before a rate-limited message is dropped
 
 # Start date - January 23, 2025 at 21:58 (timezone-aware)
 START_DATE = datetime.datetime(
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import List, Set
 
 from src.config import ADMINS_FILE, USERS_FILE
 from src.utils import load_json_file, save_json_file
@@ -11,6 +11,9 @@ class UserManager:
     def __init__(self):
         self.users: List[int] = self._load_users()
         self.admins: List[int] = self._load_admins()
+        # Sets mirror the lists for constant-time membership checks
+        self._user_ids: Set[int] = set(self.users)
+        self._admin_ids: Set[int] = set(self.admins)
 
     def _load_users(self) -> List[int]:
         """Load registered users from file."""
@@ -35,8 +38,9 @@ class UserManager:
 
     def add_user(self, user_id: int) -> bool:
         """Add a new user if not already registered."""
-        if user_id not in self.users:
+        if user_id not in self._user_ids:
             self.users.append(user_id)
+            self._user_ids.add(user_id)
             self.save_users()
             logger.info(f"New user added: {user_id}")
             return True
@@ -44,8 +48,9 @@ class UserManager:
 
     def add_admin(self, user_id: int) -> bool:
         """Add a new admin if not already an admin."""
-        if user_id not in self.admins:
+        if user_id not in self._admin_ids:
             self.admins.append(user_id)
+            self._admin_ids.add(user_id)
             self.save_admins()
             logger.info(f"New admin added: {user_id}")
             return True
@@ -53,13 +58,14 @@ class UserManager:
 
     def remove_admin(self, user_id: int) -> bool:
         """Remove a user from admin list."""
-        if user_id in self.admins:
+        if user_id in self._admin_ids:
             # Don't remove the last admin
             if len(self.admins) <= 1:
                 logger.warning(f"Cannot remove the last admin: {user_id}")
                 return False
 
             self.admins.remove(user_id)
+            self._admin_ids.discard(user_id)
             self.save_admins()
             logger.info(f"Admin removed: {user_id}")
             return True
@@ -67,7 +73,11 @@ class UserManager:
 
     def is_admin(self, user_id: int) -> bool:
         """Check if user is an admin."""
-        return user_id in self.admins
+        return user_id in self._admin_ids
+
+    def is_user(self, user_id: int) -> bool:
+        """Check if user is registered."""
+        return user_id in self._user_ids
 
     def get_all_users(self) -> List[int]:
         """Get list of all registered users."""